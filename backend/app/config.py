@@ -8,3 +8,40 @@ CORS_ORIGINS = [
     "http://localhost:5173",
     "http://127.0.0.1:5173",
 ]
+
+# WebSocket 연결 관리
+WS_HEARTBEAT_INTERVAL = int(os.getenv("WS_HEARTBEAT_INTERVAL", "25"))
+WS_IDLE_TIMEOUT = int(os.getenv("WS_IDLE_TIMEOUT", "60"))
+WS_SEND_TIMEOUT = float(os.getenv("WS_SEND_TIMEOUT", "5"))
+WS_MAX_CONNECTIONS_PER_ROOM = int(os.getenv("WS_MAX_CONNECTIONS_PER_ROOM", "1000"))
+WS_MAX_CONNECTIONS = int(os.getenv("WS_MAX_CONNECTIONS", "10000"))
+WS_MAX_SUBSCRIPTIONS = int(os.getenv("WS_MAX_SUBSCRIPTIONS", "100"))
+
+# 트렌딩 정렬: 투표 가중치가 절반으로 줄어드는 시간 (초)
+TRENDING_HALF_LIFE = int(os.getenv("TRENDING_HALF_LIFE", "21600"))
+
+# 마감된 방 아카이브 주기 (초) 및 한 번에 처리할 방 수
+ARCHIVE_INTERVAL = int(os.getenv("ARCHIVE_INTERVAL", "60"))
+ARCHIVE_BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", "100"))
+ARCHIVE_MAX_ATTEMPTS = int(os.getenv("ARCHIVE_MAX_ATTEMPTS", "3"))
+
+# 공개 목록 상위 페이지 캐시 (워커 메모리)
+HOT_PAGE_TTL = float(os.getenv("HOT_PAGE_TTL", "5"))
+HOT_PAGE_COUNT = int(os.getenv("HOT_PAGE_COUNT", "3"))
+HOT_PAGE_MAX_ENTRIES = int(os.getenv("HOT_PAGE_MAX_ENTRIES", "256"))
+
+# 투표 이벤트 기록 (내보내기용, fingerprint 없이 선택지와 시각만 저장)
+VOTE_EVENT_LOG = os.getenv("VOTE_EVENT_LOG", "false").lower() in ("1", "true", "yes")
+VOTE_EVENT_MAXLEN = int(os.getenv("VOTE_EVENT_MAXLEN", "1000000"))
+
+# 일괄 투표 엔드포인트를 쓸 수 있는 키오스크/엣지 프록시 토큰 (쉼표로 구분, 비어 있으면 엔드포인트 비활성화)
+BATCH_VOTE_TOKENS = [token.strip() for token in os.getenv("BATCH_VOTE_TOKENS", "").split(",") if token.strip()]
+
+# 내보내기 시 Redis에서 한 번에 읽는 항목 수
+EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", "1000"))
+
+# 읽기 전용 복제본 (쉼표로 구분, 비어 있으면 모든 읽기를 primary에서 처리)
+REDIS_REPLICA_URLS = [url.strip() for url in os.getenv("REDIS_REPLICA_URLS", "").split(",") if url.strip()]
+# 이 시간(초)보다 뒤처진 복제본은 라우팅에서 제외
+REDIS_REPLICA_MAX_LAG = float(os.getenv("REDIS_REPLICA_MAX_LAG", "2"))
+REDIS_REPLICA_CHECK_INTERVAL = float(os.getenv("REDIS_REPLICA_CHECK_INTERVAL", "1"))
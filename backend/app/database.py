@@ -1,19 +1,105 @@
+import asyncio
+import itertools
+import logging
+
 import redis.asyncio as redis
-from app.config import REDIS_URL
+from app.config import (
+    REDIS_REPLICA_CHECK_INTERVAL,
+    REDIS_REPLICA_MAX_LAG,
+    REDIS_REPLICA_URLS,
+    REDIS_URL,
+)
+
+logger = logging.getLogger(__name__)
+
+# primary의 TIME 값을 주기적으로 기록하고 복제본에서 읽어 지연을 측정하는 키
+# (워커마다 시계가 달라도 모두 primary 시계 기준이라 시계 차이가 지연으로 보이지 않음)
+REPLICA_HEARTBEAT_KEY = "replica:heartbeat"
 
 redis_client: redis.Redis = None
+replica_clients: list[redis.Redis] = []
+healthy_replicas: list[redis.Redis] = []
+_replica_cycle = None
 
 
 async def init_redis():
-    global redis_client
+    global redis_client, replica_clients
     redis_client = await redis.from_url(REDIS_URL, decode_responses=True)
+    replica_clients = [
+        await redis.from_url(url, decode_responses=True) for url in REDIS_REPLICA_URLS
+    ]
+    # 첫 지연 측정 전까지는 primary에서 읽음
+    set_healthy_replicas([])
 
 
 async def close_redis():
-    global redis_client
+    global redis_client, replica_clients
     if redis_client:
         await redis_client.close()
+    for replica in replica_clients:
+        await replica.close()
+    replica_clients = []
+    set_healthy_replicas([])
 
 
 def get_redis() -> redis.Redis:
     return redis_client
+
+
+def get_read_redis() -> redis.Redis:
+    """지연이 허용 범위인 복제본을 돌아가며 반환 (없으면 primary)"""
+    if _replica_cycle is None:
+        return redis_client
+    return next(_replica_cycle)
+
+
+def set_healthy_replicas(replicas: list[redis.Redis]) -> None:
+    global healthy_replicas, _replica_cycle
+    healthy_replicas = replicas
+    _replica_cycle = itertools.cycle(replicas) if replicas else None
+
+
+async def measure_replica_lag(replica: redis.Redis, now: float, interval: float) -> float:
+    """복제본의 하트비트와 현재 시각 차이로 지연(초) 추정
+
+    하트비트는 interval마다 기록되므로 그만큼은 지연으로 보지 않는다.
+    """
+    try:
+        heartbeat = await replica.get(REPLICA_HEARTBEAT_KEY)
+    except Exception:
+        return float("inf")
+    if heartbeat is None:
+        return float("inf")
+    return max(0.0, now - float(heartbeat) - interval)
+
+
+async def check_replicas(
+    max_lag: float = REDIS_REPLICA_MAX_LAG,
+    interval: float = REDIS_REPLICA_CHECK_INTERVAL,
+) -> None:
+    """복제본 지연 측정 후 라우팅 대상 갱신, primary 하트비트 기록"""
+    seconds, microseconds = await redis_client.time()
+    now = seconds + microseconds / 1_000_000
+    lags = await asyncio.gather(
+        *(measure_replica_lag(replica, now, interval) for replica in replica_clients)
+    )
+    healthy = [replica for replica, lag in zip(replica_clients, lags) if lag <= max_lag]
+    if len(healthy) != len(healthy_replicas):
+        logger.warning("읽기 복제본 %d/%d개 사용 (지연: %s)", len(healthy), len(replica_clients), lags)
+    set_healthy_replicas(healthy)
+
+    await redis_client.set(REPLICA_HEARTBEAT_KEY, now)
+
+
+async def run_replica_monitor(interval: float = REDIS_REPLICA_CHECK_INTERVAL) -> None:
+    """복제본이 설정된 경우 주기적으로 지연 확인"""
+    if not replica_clients:
+        return
+    while True:
+        try:
+            await check_replicas(interval=interval)
+        except Exception:
+            # primary 하트비트 기록 실패 등: 복제본 지연을 알 수 없으므로 primary에서 읽음
+            logger.exception("읽기 복제본 상태 확인 실패")
+            set_healthy_replicas([])
+        await asyncio.sleep(interval)
@@ -1,17 +1,31 @@
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import asynccontextmanager, suppress
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.config import CORS_ORIGINS
-from app.database import init_redis, close_redis
+from app.database import init_redis, close_redis, run_replica_monitor
 from app.routers import health, rooms, websocket
+from app.routers.websocket import close_scheduler
+from app.services.archive import run_archiver
+from app.services.connection import manager
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await init_redis()
+    manager.start()
+    close_scheduler.start()
+    archiver_task = asyncio.create_task(run_archiver())
+    replica_monitor_task = asyncio.create_task(run_replica_monitor())
     yield
+    for task in (archiver_task, replica_monitor_task):
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+    await close_scheduler.stop()
+    await manager.stop()
     await close_redis()
 
 
@@ -0,0 +1,267 @@
+"""보조 인덱스 점검/복구 도구
+
+room:* 문서를 기준으로 rooms:list, rooms:popular, rooms:trending, rooms:expiry,
+rooms:tags:* 인덱스를 검증하고 (아카이브에서 제외된 방은 rooms:expiry 대신 parked로 보고), 방 문서가 없는 인덱스 항목과 데이터 키(고아)를 보고한다.
+기본은 점검만 하며 --repair 옵션을 주면 복구한다.
+
+    python -m app.maintenance [--repair] [--batch-size 500] [--rate 2000] [--grace 5]
+"""
+import argparse
+import asyncio
+import json
+import time
+from datetime import datetime
+
+from app import database
+from app.services.archive import ARCHIVE_PARKED_KEY
+from app.services.room import trending_vote_weight
+
+SORTED_INDEXES = ("rooms:list", "rooms:popular", "rooms:trending", "rooms:expiry")
+# 고아 데이터 키를 삭제하기 전 방 문서를 다시 확인할 때까지 기다리는 시간 (생성 중인 방 보호)
+ORPHAN_GRACE_SECONDS = 5.0
+DATA_KEY_PREFIXES = ("votes:", "voted:", "comments:", "vote_events:", "roster:remaining:", "roster:option:", "roster:")
+
+
+class RateLimiter:
+    """초당 Redis 명령 수 제한 (운영 Redis 지연 방지)"""
+
+    def __init__(self, ops_per_second: float):
+        self.ops_per_second = ops_per_second
+        self._started = time.monotonic()
+        self._ops = 0
+
+    async def acquire(self, ops: int) -> None:
+        if self.ops_per_second <= 0:
+            return
+        self._ops += ops
+        expected = self._ops / self.ops_per_second
+        elapsed = time.monotonic() - self._started
+        if expected > elapsed:
+            await asyncio.sleep(expected - elapsed)
+
+
+def expected_index_entries(room: dict) -> dict:
+    """방 문서로부터 인덱스별 기대값 계산"""
+    created_at = datetime.fromisoformat(room["created_at"]).timestamp()
+    total_votes = room.get("total_votes", 0)
+    return {
+        "rooms:list": created_at,
+        "rooms:popular": total_votes,
+        # 감쇠 이력은 복원할 수 없으므로 생성 시각에 모든 표가 들어온 것으로 근사
+        "rooms:trending": trending_vote_weight(created_at, total_votes) if total_votes else float("-inf"),
+        "rooms:expiry": datetime.fromisoformat(room["expires_at"]).timestamp(),
+    }
+
+
+def room_uuid_from_key(key: str) -> str | None:
+    """데이터 키에서 방 UUID 추출"""
+    for prefix in DATA_KEY_PREFIXES:
+        if key.startswith(prefix):
+            rest = key[len(prefix):]
+            if prefix == "roster:option:":
+                return rest.rsplit(":", 1)[0]
+            return rest.split(":", 1)[0]
+    return None
+
+
+async def _scan_keys(redis, match: str, batch_size: int, limiter: RateLimiter):
+    cursor = 0
+    while True:
+        cursor, keys = await redis.scan(cursor=cursor, match=match, count=batch_size)
+        await limiter.acquire(1)
+        if keys:
+            yield keys
+        if cursor == 0:
+            break
+
+
+async def verify_room_indexes(redis, batch_size: int, limiter: RateLimiter, repair: bool, report: dict) -> None:
+    """room:* 문서마다 인덱스 누락/불일치 확인"""
+    async for keys in _scan_keys(redis, "room:*", batch_size, limiter):
+        async with redis.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.get(key)
+            raw_rooms = await pipe.execute()
+        await limiter.acquire(len(keys))
+
+        rooms = [json.loads(raw) for raw in raw_rooms if raw]
+        report["rooms"] += len(rooms)
+
+        async with redis.pipeline(transaction=False) as pipe:
+            for room in rooms:
+                pipe.zscore(ARCHIVE_PARKED_KEY, room["uuid"])
+                for index_key in SORTED_INDEXES:
+                    pipe.zscore(index_key, room["uuid"])
+                for tag in room.get("tags", []):
+                    pipe.sismember(f"rooms:tags:{tag}", room["uuid"])
+            responses = iter(await pipe.execute())
+        await limiter.acquire(len(rooms) * (len(SORTED_INDEXES) + 1))
+
+        fixes = []
+        for room in rooms:
+            expected = expected_index_entries(room)
+            parked = next(responses) is not None
+            if parked:
+                report["parked"] += 1
+            for index_key in SORTED_INDEXES:
+                score = next(responses)
+                if parked and index_key == "rooms:expiry":
+                    # 아카이브에 계속 실패해 일부러 뺀 방은 다시 넣지 않음
+                    continue
+                if score is None:
+                    report["missing"][index_key] += 1
+                    fixes.append(("zadd", index_key, room["uuid"], expected[index_key]))
+                elif index_key in ("rooms:list", "rooms:popular", "rooms:expiry") and score != expected[index_key]:
+                    # 트렌딩 점수는 누적 값이라 존재 여부만 확인
+                    report["mismatched"][index_key] += 1
+                    fixes.append(("zadd", index_key, room["uuid"], expected[index_key]))
+            for tag in room.get("tags", []):
+                if not next(responses):
+                    report["missing"]["rooms:tags:*"] += 1
+                    fixes.append(("sadd", f"rooms:tags:{tag}", room["uuid"], None))
+
+        if repair and fixes:
+            async with redis.pipeline(transaction=False) as pipe:
+                for command, key, member, score in fixes:
+                    if command == "zadd":
+                        pipe.zadd(key, {member: score})
+                    else:
+                        pipe.sadd(key, member)
+                await pipe.execute()
+            await limiter.acquire(len(fixes))
+
+
+async def _remove_orphan_members(
+    redis, index_key: str, members: list[str], limiter: RateLimiter, repair: bool, report: dict
+) -> None:
+    async with redis.pipeline(transaction=False) as pipe:
+        for member in members:
+            pipe.exists(f"room:{member}")
+        exists = await pipe.execute()
+    await limiter.acquire(len(members))
+
+    orphans = [member for member, found in zip(members, exists) if not found]
+    report_key = "rooms:tags:*" if index_key.startswith("rooms:tags:") else index_key
+    report["orphan_members"][report_key] += len(orphans)
+    if repair and orphans:
+        if index_key.startswith("rooms:tags:"):
+            await redis.srem(index_key, *orphans)
+        else:
+            await redis.zrem(index_key, *orphans)
+        await limiter.acquire(1)
+
+
+async def find_orphan_index_members(redis, batch_size: int, limiter: RateLimiter, repair: bool, report: dict) -> None:
+    """방 문서가 없는 인덱스 항목 확인"""
+    for index_key in SORTED_INDEXES:
+        cursor = 0
+        while True:
+            cursor, entries = await redis.zscan(index_key, cursor=cursor, count=batch_size)
+            await limiter.acquire(1)
+            if entries:
+                await _remove_orphan_members(
+                    redis, index_key, [member for member, _ in entries], limiter, repair, report
+                )
+            if cursor == 0:
+                break
+
+    async for tag_keys in _scan_keys(redis, "rooms:tags:*", batch_size, limiter):
+        for tag_key in tag_keys:
+            cursor = 0
+            while True:
+                cursor, members = await redis.sscan(tag_key, cursor=cursor, count=batch_size)
+                await limiter.acquire(1)
+                if members:
+                    await _remove_orphan_members(redis, tag_key, members, limiter, repair, report)
+                if cursor == 0:
+                    break
+
+
+async def _filter_orphan_keys(redis, keys: list[str], limiter: RateLimiter) -> list[str]:
+    async with redis.pipeline(transaction=False) as pipe:
+        for key in keys:
+            room_uuid = room_uuid_from_key(key)
+            # 아카이브된 방의 투표 이벤트 스트림은 스냅샷과 함께 유지
+            pipe.exists(f"room:{room_uuid}", f"archive:{room_uuid}")
+        exists = await pipe.execute()
+    await limiter.acquire(len(keys))
+    return [key for key, found in zip(keys, exists) if not found]
+
+
+async def find_orphan_data_keys(
+    redis,
+    batch_size: int,
+    limiter: RateLimiter,
+    repair: bool,
+    report: dict,
+    grace: float = ORPHAN_GRACE_SECONDS,
+) -> None:
+    """방 문서가 없는 결과/투표자/댓글/이벤트/명단 키 확인
+
+    복구 시에는 grace초 뒤 방 문서를 다시 확인해 그 사이 생성이 끝난 방의 키는 남긴다.
+    """
+    candidates = []
+    for pattern in ("votes:*", "voted:*", "comments:*", "vote_events:*", "roster:*"):
+        async for keys in _scan_keys(redis, pattern, batch_size, limiter):
+            orphans = await _filter_orphan_keys(redis, keys, limiter)
+            if repair:
+                candidates.extend(orphans)
+            else:
+                report["orphan_keys"] += len(orphans)
+
+    if not candidates:
+        return
+    await asyncio.sleep(grace)
+    for start in range(0, len(candidates), batch_size):
+        orphans = await _filter_orphan_keys(redis, candidates[start:start + batch_size], limiter)
+        report["orphan_keys"] += len(orphans)
+        if orphans:
+            await redis.unlink(*orphans)
+            await limiter.acquire(1)
+
+
+async def run(
+    repair: bool = False,
+    batch_size: int = 500,
+    rate: float = 2000,
+    grace: float = ORPHAN_GRACE_SECONDS,
+) -> dict:
+    """전체 점검 실행 후 보고서 반환"""
+    redis = database.get_redis()
+    limiter = RateLimiter(rate)
+    report = {
+        "repair": repair,
+        "rooms": 0,
+        "missing": {key: 0 for key in (*SORTED_INDEXES, "rooms:tags:*")},
+        "mismatched": {key: 0 for key in SORTED_INDEXES},
+        "orphan_members": {key: 0 for key in (*SORTED_INDEXES, "rooms:tags:*")},
+        "orphan_keys": 0,
+        "parked": 0,
+    }
+
+    await verify_room_indexes(redis, batch_size, limiter, repair, report)
+    await find_orphan_index_members(redis, batch_size, limiter, repair, report)
+    await find_orphan_data_keys(redis, batch_size, limiter, repair, report, grace)
+    return report
+
+
+async def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="FastVote 보조 인덱스 점검/복구")
+    parser.add_argument("--repair", action="store_true", help="누락된 인덱스 복구 및 고아 항목 삭제")
+    parser.add_argument("--batch-size", type=int, default=500, help="SCAN/파이프라인 배치 크기")
+    parser.add_argument("--rate", type=float, default=2000, help="초당 최대 Redis 명령 수 (0이면 제한 없음)")
+    parser.add_argument(
+        "--grace", type=float, default=ORPHAN_GRACE_SECONDS, help="고아 데이터 키 삭제 전 재확인 대기 시간 (초)"
+    )
+    args = parser.parse_args(argv)
+
+    await database.init_redis()
+    try:
+        report = await run(repair=args.repair, batch_size=args.batch_size, rate=args.rate, grace=args.grace)
+    finally:
+        await database.close_redis()
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -6,6 +6,12 @@ from pydantic import BaseModel, Field, field_validator, model_validator
 class SortOrder(str, Enum):
     latest = "latest"
     popular = "popular"
+    trending = "trending"
+
+
+class ExportFormat(str, Enum):
+    csv = "csv"
+    ndjson = "ndjson"
 
 
 class RoomCreate(BaseModel):
@@ -97,6 +103,37 @@ class VoteRequest(BaseModel):
         return v.strip() if v else None
 
 
+class BatchVoteItem(VoteRequest):
+    room_uuid: str
+
+
+class BatchVoteRequest(BaseModel):
+    votes: list[BatchVoteItem]
+
+    @field_validator('votes')
+    @classmethod
+    def validate_votes(cls, v):
+        if len(v) < 1:
+            raise ValueError('최소 1개의 투표가 필요합니다')
+        if len(v) > 500:
+            raise ValueError('한 번에 최대 500개의 투표만 제출할 수 있습니다')
+        return v
+
+
+class BatchVoteResult(BaseModel):
+    index: int
+    room_uuid: str
+    success: bool
+    status_code: int
+    detail: str
+
+
+class BatchVoteResponse(BaseModel):
+    results: list[BatchVoteResult]
+    accepted: int
+    rejected: int
+
+
 class PasswordVerifyRequest(BaseModel):
     password: str | None = None
     share_token: str | None = None
@@ -1,24 +1,53 @@
-from fastapi import APIRouter, HTTPException, Query, Request
-
-from app.models.schemas import RoomCreate, VoteRequest, PasswordVerifyRequest, SortOrder, RoomListResponse, CommentCreate, Comment
+import hmac
+
+from fastapi import APIRouter, Header, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+
+from app.config import BATCH_VOTE_TOKENS
+from app.models.schemas import (
+    RoomCreate,
+    VoteRequest,
+    BatchVoteRequest,
+    BatchVoteResponse,
+    PasswordVerifyRequest,
+    SortOrder,
+    RoomListResponse,
+    CommentCreate,
+    Comment,
+    ExportFormat,
+)
 from app.services.room import (
     create_room,
     get_remaining_participants,
     get_room,
     get_room_list,
+    get_rooms,
     get_vote_results,
     is_room_expired,
 )
-from app.services.vote import has_voted, cast_vote
+from app.services.vote import VOTE_ACCEPTED, VOTE_ROOM_CLOSED, has_voted, cast_vote, cast_votes
 from app.services.comment import create_comment, get_comments
-from app.utils.security import verify_password
+from app.services.archive import get_archived_room, iter_archived_comments
+from app.services.export import stream_export
+from app.services.list_cache import hot_pages
+from app.services.roster import (
+    CLAIM_ALREADY_VOTED,
+    CLAIM_OK,
+    CLAIM_OPTION_FORBIDDEN,
+    claim_participant,
+    claim_participants,
+    get_roster_view,
+    is_roster_room,
+    release_participant,
+)
+from app.utils.security import generate_vote_hash, verify_password
 from app.routers.websocket import broadcast_results
 from app.database import get_redis
 
 router = APIRouter(prefix="/rooms", tags=["rooms"])
 
 
-def serialize_room_response(room: dict) -> dict:
+async def serialize_room_response(room: dict) -> dict:
     """클라이언트에는 제한 투표의 남은 참여자만 노출한다."""
     response = room.copy()
     response.pop("password_hash", None)
@@ -26,6 +55,14 @@ def serialize_room_response(room: dict) -> dict:
     response.pop("share_token", None)
     response["is_expired"] = is_room_expired(room)
 
+    if is_roster_room(room):
+        roster = await get_roster_view(room["uuid"], room)
+        response["is_restricted"] = True
+        response["participants"] = roster["remaining_participants"]
+        response["remaining_participants"] = roster["remaining_participants"]
+        response["option_allowed_participants"] = roster["option_allowed_participants"]
+        return response
+
     is_restricted = bool(room.get("participants", []))
     response["is_restricted"] = is_restricted
     if is_restricted:
@@ -36,6 +73,17 @@ def serialize_room_response(room: dict) -> dict:
     return response
 
 
+async def load_room(room_uuid: str, read_replica: bool = False) -> tuple[dict | None, dict | None]:
+    """라이브 방 또는 아카이브 스냅샷 조회 (room, snapshot)"""
+    room = await get_room(room_uuid, read_replica=read_replica)
+    if room:
+        return room, None
+    snapshot = await get_archived_room(room_uuid)
+    if snapshot:
+        return snapshot["room"], snapshot
+    return None, None
+
+
 @router.get("", response_model=RoomListResponse)
 async def list_rooms(
     search: str | None = Query(None, description="제목 검색"),
@@ -45,13 +93,20 @@ async def list_rooms(
     page_size: int = Query(20, ge=1, le=100, description="페이지 크기"),
 ):
     """투표방 목록 조회"""
-    return await get_room_list(
-        search=search,
-        tags=tags,
-        sort=sort.value,
-        page=page,
-        page_size=page_size
-    )
+    async def compute():
+        return await get_room_list(
+            search=search,
+            tags=tags,
+            sort=sort.value,
+            page=page,
+            page_size=page_size
+        )
+
+    # 검색 없는 앞쪽 페이지는 워커 메모리 캐시에서 제공
+    cache_key = hot_pages.cache_key(search, tags, sort.value, page, page_size)
+    if cache_key is None:
+        return await compute()
+    return await hot_pages.get_or_compute(cache_key, compute)
 
 
 @router.post("")
@@ -73,17 +128,17 @@ async def create_room_endpoint(room: RoomCreate):
 @router.get("/{room_uuid}")
 async def get_room_info(room_uuid: str):
     """투표방 조회"""
-    room = await get_room(room_uuid)
+    room, _ = await load_room(room_uuid, read_replica=True)
     if not room:
         raise HTTPException(status_code=404, detail="투표방을 찾을 수 없습니다")
 
-    return serialize_room_response(room)
+    return await serialize_room_response(room)
 
 
 @router.post("/{room_uuid}/verify")
 async def verify_room_password(room_uuid: str, request: PasswordVerifyRequest):
     """비밀번호 검증"""
-    room = await get_room(room_uuid)
+    room, _ = await load_room(room_uuid)
     if not room:
         raise HTTPException(status_code=404, detail="투표방을 찾을 수 없습니다")
 
@@ -100,57 +155,203 @@ async def verify_room_password(room_uuid: str, request: PasswordVerifyRequest):
     raise HTTPException(status_code=403, detail="비밀번호가 일치하지 않습니다")
 
 
-@router.post("/{room_uuid}/vote")
-async def vote(room_uuid: str, vote_request: VoteRequest, request: Request):
-    """투표"""
-    room = await get_room(room_uuid)
-    if not room:
-        raise HTTPException(status_code=404, detail="투표방을 찾을 수 없습니다")
+def claim_error(status: int, option: str | None, participant: str) -> HTTPException | None:
+    """명단 소진 결과를 HTTP 오류로 변환 (성공이면 None)"""
+    if status == CLAIM_OK:
+        return None
+    if status == CLAIM_ALREADY_VOTED:
+        return HTTPException(status_code=409, detail="이미 투표한 참여자입니다")
+    if status == CLAIM_OPTION_FORBIDDEN:
+        return HTTPException(
+            status_code=403,
+            detail=f"{participant}님은 선택할 수 없는 옵션입니다: {option}",
+        )
+    return HTTPException(status_code=400, detail="참여 인원에 없는 이름입니다")
+
 
+def validate_vote_request(room: dict, options: list[str], participant: str | None) -> str | None:
+    """투표 요청 검증 후 소진할 제한 투표 참여자 반환
+
+    명단을 별도 키로 관리하는 방은 참여자 선택 여부만 확인하고,
+    명단/권한 확인은 claim_participant에서 소진과 함께 처리한다.
+    """
     if is_room_expired(room):
         raise HTTPException(status_code=410, detail="투표가 마감되었습니다")
 
     # 모든 선택한 옵션이 유효한지 확인
-    for option in vote_request.options:
+    for option in options:
         if option not in room["options"]:
             raise HTTPException(status_code=400, detail=f"유효하지 않은 옵션입니다: {option}")
 
     # 복수 선택 허용 여부 확인
-    if not room.get("allow_multiple", False) and len(vote_request.options) > 1:
+    if not room.get("allow_multiple", False) and len(options) > 1:
         raise HTTPException(status_code=400, detail="이 투표는 복수 선택이 허용되지 않습니다")
 
-    participants = room.get("participants", [])
-    participant_to_remove = None
-    if participants:
-        if not vote_request.participant:
+    if is_roster_room(room):
+        if not participant:
             raise HTTPException(status_code=400, detail="참여자를 선택해주세요")
+        return participant
 
-        if vote_request.participant not in participants:
-            raise HTTPException(status_code=400, detail="참여 인원에 없는 이름입니다")
-
-        remaining_participants = get_remaining_participants(room)
-        if vote_request.participant not in remaining_participants:
-            raise HTTPException(status_code=409, detail="이미 투표한 참여자입니다")
-
-        option_allowed_participants = room.get("option_allowed_participants", [])
-        for option in vote_request.options:
-            option_index = room["options"].index(option)
-            if option_index < len(option_allowed_participants):
-                allowed_participants = option_allowed_participants[option_index]
+    participants = room.get("participants", [])
+    if not participants:
+        return None
+
+    if not participant:
+        raise HTTPException(status_code=400, detail="참여자를 선택해주세요")
+
+    if participant not in participants:
+        raise HTTPException(status_code=400, detail="참여 인원에 없는 이름입니다")
+
+    remaining_participants = get_remaining_participants(room)
+    if participant not in remaining_participants:
+        raise HTTPException(status_code=409, detail="이미 투표한 참여자입니다")
+
+    option_allowed_participants = room.get("option_allowed_participants", [])
+    for option in options:
+        option_index = room["options"].index(option)
+        if option_index < len(option_allowed_participants):
+            allowed_participants = option_allowed_participants[option_index]
+        else:
+            allowed_participants = participants
+
+        if participant not in allowed_participants:
+            raise HTTPException(
+                status_code=403,
+                detail=f"{participant}님은 선택할 수 없는 옵션입니다: {option}",
+            )
+    return participant
+
+
+def authorize_batch_client(token: str | None) -> None:
+    """일괄 투표 토큰 확인 (설정된 토큰 중 하나와 일치해야 함)"""
+    if not token or not any(
+        hmac.compare_digest(token.encode(), allowed.encode()) for allowed in BATCH_VOTE_TOKENS
+    ):
+        raise HTTPException(status_code=403, detail="일괄 투표 권한이 없습니다")
+
+
+@router.post("/votes/batch", response_model=BatchVoteResponse)
+async def vote_batch(
+    batch: BatchVoteRequest,
+    request: Request,
+    x_batch_token: str | None = Header(None, description="키오스크/엣지 프록시용 일괄 투표 토큰"),
+):
+    """투표 일괄 제출 (키오스크/엣지 프록시 재전송용)"""
+    authorize_batch_client(x_batch_token)
+    client_ip = request.client.host
+    rooms = await get_rooms(list(dict.fromkeys(item.room_uuid for item in batch.votes)))
+
+    results = []
+    candidates = []
+    seen_vote_keys = set()
+    claimed_participants = set()
+    for index, item in enumerate(batch.votes):
+        result = {"index": index, "room_uuid": item.room_uuid, "success": False}
+        results.append(result)
+
+        room = rooms.get(item.room_uuid)
+        if not room:
+            result.update(status_code=404, detail="투표방을 찾을 수 없습니다")
+            continue
+
+        try:
+            participant = validate_vote_request(room, item.options, item.participant)
+        except HTTPException as e:
+            result.update(status_code=e.status_code, detail=e.detail)
+            continue
+
+        # 같은 배치 안의 중복 투표
+        vote_key = (item.room_uuid, generate_vote_hash(item.fingerprint, client_ip))
+        participant_key = (item.room_uuid, participant)
+        if vote_key in seen_vote_keys:
+            result.update(status_code=409, detail="이미 투표하셨습니다")
+            continue
+        if participant and participant_key in claimed_participants:
+            result.update(status_code=409, detail="이미 투표한 참여자입니다")
+            continue
+        seen_vote_keys.add(vote_key)
+        if participant:
+            claimed_participants.add(participant_key)
+
+        candidates.append((result, {
+            "room_uuid": item.room_uuid,
+            "options": item.options,
+            "fingerprint": item.fingerprint,
+            "participant": participant,
+        }))
+
+    # 명단 방 참여자는 파이프라인으로 한 번에 검증/소진
+    roster_candidates = [
+        (result, vote) for result, vote in candidates
+        if vote["participant"] and is_roster_room(rooms[vote["room_uuid"]])
+    ]
+    claims = await claim_participants([
+        (vote["room_uuid"], rooms[vote["room_uuid"]], vote["participant"], vote["options"])
+        for _, vote in roster_candidates
+    ])
+    for (result, vote), (status, option) in zip(roster_candidates, claims):
+        error = claim_error(status, option, vote["participant"])
+        if error:
+            result.update(status_code=error.status_code, detail=error.detail)
+        else:
+            # 명단에서 이미 소진했으므로 기존 방식의 참여자 갱신은 생략
+            vote["roster_participant"] = vote.pop("participant")
+    candidates = [(result, vote) for result, vote in candidates if "status_code" not in result]
+
+    accepted_rooms = set()
+    if candidates:
+        statuses = await cast_votes([vote for _, vote in candidates], client_ip)
+        for (result, vote), status in zip(candidates, statuses):
+            if status == VOTE_ACCEPTED:
+                result.update(success=True, status_code=200, detail="투표가 완료되었습니다")
+                accepted_rooms.add(vote["room_uuid"])
             else:
-                allowed_participants = participants
+                if status == VOTE_ROOM_CLOSED:
+                    # 조회 이후 방이 만료/아카이브된 경우
+                    result.update(status_code=410, detail="투표가 마감되었습니다")
+                else:
+                    result.update(status_code=409, detail="이미 투표하셨습니다")
+                if vote.get("roster_participant"):
+                    await release_participant(vote["room_uuid"], vote["roster_participant"])
+
+    # 영향받은 방마다 한 번만 브로드캐스트
+    for room_uuid in accepted_rooms:
+        await broadcast_results(room_uuid)
+
+    accepted_count = sum(1 for result in results if result["success"])
+    return {
+        "results": results,
+        "accepted": accepted_count,
+        "rejected": len(results) - accepted_count,
+    }
 
-            if vote_request.participant not in allowed_participants:
-                raise HTTPException(
-                    status_code=403,
-                    detail=f"{vote_request.participant}님은 선택할 수 없는 옵션입니다: {option}",
-                )
-        participant_to_remove = vote_request.participant
+
+@router.post("/{room_uuid}/vote")
+async def vote(room_uuid: str, vote_request: VoteRequest, request: Request):
+    """투표"""
+    room = await get_room(room_uuid)
+    if not room:
+        if await get_archived_room(room_uuid):
+            raise HTTPException(status_code=410, detail="투표가 마감되었습니다")
+        raise HTTPException(status_code=404, detail="투표방을 찾을 수 없습니다")
+
+    participant_to_remove = validate_vote_request(
+        room, vote_request.options, vote_request.participant
+    )
 
     client_ip = request.client.host
     if await has_voted(room_uuid, vote_request.fingerprint, client_ip):
         raise HTTPException(status_code=409, detail="이미 투표하셨습니다")
 
+    if participant_to_remove and is_roster_room(room):
+        status, option = await claim_participant(
+            room_uuid, room, participant_to_remove, vote_request.options
+        )
+        error = claim_error(status, option, participant_to_remove)
+        if error:
+            raise error
+        participant_to_remove = None
+
     await cast_vote(
         room_uuid,
         vote_request.options,
@@ -171,7 +372,7 @@ async def get_results(
     share_token: str | None = Query(None, description="Share token for creator access"),
 ):
     """투표 결과 조회"""
-    room = await get_room(room_uuid)
+    room, snapshot = await load_room(room_uuid, read_replica=True)
     if not room:
         raise HTTPException(status_code=404, detail="투표방을 찾을 수 없습니다")
 
@@ -180,9 +381,14 @@ async def get_results(
         if not share_token or share_token != room.get("share_token"):
             raise HTTPException(status_code=410, detail="투표가 마감되었습니다")
 
-    results = await get_vote_results(room_uuid)
+    # 아카이브된 방은 스냅샷의 최종 결과 사용 (투표자별 키는 이미 정리됨)
+    if snapshot:
+        results = snapshot["results"]
+    else:
+        results = await get_vote_results(room_uuid, read_replica=True)
+    # 중복 투표 여부는 방금 한 투표도 보이도록 primary에서 확인
     has_voted_flag: bool | None = None
-    if fingerprint:
+    if fingerprint and not snapshot:
         client_ip = request.client.host
         has_voted_flag = await has_voted(room_uuid, fingerprint, client_ip)
 
@@ -197,11 +403,37 @@ async def get_results(
     return response
 
 
+@router.get("/{room_uuid}/export")
+async def export_room(
+    room_uuid: str,
+    export_format: ExportFormat = Query(ExportFormat.csv, alias="format", description="내보내기 형식"),
+    share_token: str | None = Query(None, description="Share token for creator access"),
+):
+    """결과/댓글/투표 이벤트 내보내기 (스트리밍)"""
+    room, snapshot = await load_room(room_uuid, read_replica=True)
+    if not room:
+        raise HTTPException(status_code=404, detail="투표방을 찾을 수 없습니다")
+
+    # 결과 조회와 같은 규칙: 만료 후에는 share_token 필요
+    if is_room_expired(room):
+        if not share_token or share_token != room.get("share_token"):
+            raise HTTPException(status_code=410, detail="투표가 마감되었습니다")
+
+    media_type = "text/csv; charset=utf-8" if export_format == ExportFormat.csv else "application/x-ndjson"
+    return StreamingResponse(
+        stream_export(room_uuid, room, export_format.value, snapshot),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{room_uuid}.{export_format.value}"'},
+    )
+
+
 @router.post("/{room_uuid}/comments", response_model=Comment)
 async def create_comment_endpoint(room_uuid: str, comment: CommentCreate):
     """댓글 작성"""
     room = await get_room(room_uuid)
     if not room:
+        if await get_archived_room(room_uuid):
+            raise HTTPException(status_code=410, detail="투표가 마감되었습니다")
         raise HTTPException(status_code=404, detail="투표방을 찾을 수 없습니다")
 
     # 방의 남은 TTL 가져오기
@@ -219,8 +451,10 @@ async def create_comment_endpoint(room_uuid: str, comment: CommentCreate):
 @router.get("/{room_uuid}/comments", response_model=list[Comment])
 async def list_comments(room_uuid: str):
     """댓글 목록 조회"""
-    room = await get_room(room_uuid)
+    room, snapshot = await load_room(room_uuid, read_replica=True)
     if not room:
         raise HTTPException(status_code=404, detail="투표방을 찾을 수 없습니다")
 
-    return await get_comments(room_uuid)
+    if snapshot:
+        return [comment async for chunk in iter_archived_comments(room_uuid, snapshot) for comment in chunk]
+    return await get_comments(room_uuid, read_replica=True)
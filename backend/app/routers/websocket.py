@@ -1,59 +1,238 @@
 import json
-from typing import Dict, Set
+from datetime import datetime
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 
-from app.services.room import get_room, get_vote_results
+from app.services.archive import get_archived_room
+from app.services.connection import ConnectionLimitError, WS_CLOSE_TRY_AGAIN_LATER, manager
+from app.services.room import get_room, get_rooms, get_vote_results, get_vote_results_bulk
+from app.services.scheduler import CloseScheduler
+from app.services.wire import COMPACT_SUBPROTOCOL, RESYNC_MESSAGE, RoomWireState
 
 router = APIRouter()
 
-active_connections: Dict[str, Set[WebSocket]] = {}
+# 다중 구독 연결 (마감 시 소켓은 유지하고 해당 방 구독만 해제)
+multiplexed_connections: set[WebSocket] = set()
 
 
 async def broadcast_results(room_uuid: str):
     """WebSocket으로 투표 결과 브로드캐스트"""
-    if room_uuid in active_connections:
+    if room_uuid in manager.active_connections:
         results = await get_vote_results(room_uuid)
-        message = json.dumps({"type": "vote_update", "results": results})
+        message = json.dumps({"type": "vote_update", "room_uuid": room_uuid, "results": results})
+        state = manager.wire_states.get(room_uuid)
+        compact_message = state.update(results) if state else None
+        await manager.broadcast(room_uuid, message, compact_message)
+
+
+async def close_room(room_uuid: str) -> None:
+    """마감 시각에 최종 결과를 한 번 보내고 구독 정리"""
+    connections = list(manager.active_connections.get(room_uuid, ()))
+    if not connections:
+        return
+
+    results = await get_vote_results(room_uuid)
+    if not results:
+        # 이미 아카이브된 방은 스냅샷의 최종 결과 사용
+        snapshot = await get_archived_room(room_uuid)
+        results = snapshot["results"] if snapshot else {}
+
+    message = json.dumps({"type": "room_closed", "room_uuid": room_uuid, "results": results})
+    state = manager.wire_states.get(room_uuid)
+    await manager.broadcast(room_uuid, message, state.closed_frame(results) if state else None)
+
+    for connection in connections:
+        if connection in multiplexed_connections:
+            manager.unsubscribe(room_uuid, connection)
+        else:
+            await manager.close(connection, 1000, "투표가 마감되었습니다")
+
+
+close_scheduler = CloseScheduler(close_room)
+
+
+def schedule_close(room_uuid: str, room: dict) -> None:
+    """구독자가 있는 방의 마감 이벤트 예약"""
+    expires_at = room.get("expires_at")
+    if expires_at:
+        close_scheduler.schedule(room_uuid, datetime.fromisoformat(expires_at).timestamp())
 
-        disconnected = set()
-        for connection in active_connections[room_uuid]:
-            try:
-                await connection.send_text(message)
-            except:
-                disconnected.add(connection)
 
-        active_connections[room_uuid] -= disconnected
+def release_rooms(room_uuids) -> None:
+    """구독자가 모두 떠난 방의 마감 예약 취소"""
+    for room_uuid in room_uuids:
+        if room_uuid not in manager.active_connections:
+            close_scheduler.cancel(room_uuid)
 
 
 @router.websocket("/ws/rooms/{room_uuid}")
 async def websocket_endpoint(websocket: WebSocket, room_uuid: str):
-    """WebSocket 실시간 구독"""
-    await websocket.accept()
+    """WebSocket 실시간 구독 (fastvote.compact.v1 협상 시 인덱스 기반 델타 프레임)"""
+    compact = COMPACT_SUBPROTOCOL in websocket.scope.get("subprotocols", [])
+    await websocket.accept(subprotocol=COMPACT_SUBPROTOCOL if compact else None)
 
     room = await get_room(room_uuid)
     if not room:
         await websocket.close(code=1008, reason="투표방을 찾을 수 없습니다")
         return
 
-    if room_uuid not in active_connections:
-        active_connections[room_uuid] = set()
-    active_connections[room_uuid].add(websocket)
+    try:
+        manager.connect(room_uuid, websocket)
+    except ConnectionLimitError as e:
+        await websocket.close(code=WS_CLOSE_TRY_AGAIN_LATER, reason=str(e))
+        return
+    if compact:
+        manager.mark_compact(websocket)
 
     try:
         results = await get_vote_results(room_uuid)
+        if compact:
+            await send_compact_snapshot(websocket, room_uuid, room, results)
+        else:
+            await websocket.send_text(json.dumps({
+                "type": "initial_results",
+                "room_uuid": room_uuid,
+                "results": results
+            }))
+        schedule_close(room_uuid, room)
+
+        # 클라이언트 메시지(pong 포함)는 생존 신호로만 사용
+        while True:
+            message = await websocket.receive_text()
+            manager.touch(websocket)
+            if compact and message == RESYNC_MESSAGE:
+                state = manager.wire_states.get(room_uuid)
+                if state:
+                    await websocket.send_text(state.snapshot_frame())
+
+    except WebSocketDisconnect:
+        pass
+    finally:
+        manager.disconnect(websocket)
+        release_rooms([room_uuid])
+
+
+async def send_compact_snapshot(websocket: WebSocket, room_uuid: str, room: dict, results: dict) -> None:
+    """델타 상태를 최신 결과로 맞춘 뒤 스냅샷 전송"""
+    state = manager.wire_states.get(room_uuid)
+    if state is None:
+        manager.wire_states[room_uuid] = state = RoomWireState(room["options"], results)
+    else:
+        # 다른 워커에서 들어온 표 등으로 상태가 뒤처졌다면 기존 구독자에게도 델타 전송
+        compact_message = state.update(results)
+        if compact_message is not None:
+            existing = [
+                connection for connection in manager.active_connections.get(room_uuid, ())
+                if connection in manager.compact_connections and connection not in manager.awaiting_snapshot
+            ]
+            await manager.send_many(existing, compact_message)
+    frame = state.snapshot_frame()
+    # 스냅샷 seq 이후의 델타부터 받도록 전송 직전에 표시 (사이에 await 없음)
+    manager.snapshot_sent(websocket)
+    await websocket.send_text(frame)
+
+
+async def subscribe_rooms(websocket: WebSocket, room_uuids: list[str]) -> None:
+    """여러 방 구독 후 초기 결과를 한 번의 조회로 전송"""
+    current = manager.subscriptions.get(websocket, ())
+    room_uuids = [room_uuid for room_uuid in dict.fromkeys(room_uuids) if room_uuid not in current]
+
+    # 남은 구독 한도를 넘는 방은 조회하지 않고 오류 한 번으로 거절
+    if manager.max_subscriptions:
+        available = max(manager.max_subscriptions - len(current), 0)
+        if len(room_uuids) > available:
+            await websocket.send_text(json.dumps({
+                "type": "subscribe_error",
+                "rejected": len(room_uuids) - available,
+                "detail": "구독 가능한 투표방 수를 초과했습니다",
+            }))
+            room_uuids = room_uuids[:available]
+    if not room_uuids:
+        return
+
+    rooms = await get_rooms(room_uuids)
+
+    subscribed = []
+    for room_uuid in room_uuids:
+        if room_uuid not in rooms:
+            await websocket.send_text(json.dumps({
+                "type": "subscribe_error",
+                "room_uuid": room_uuid,
+                "detail": "투표방을 찾을 수 없습니다",
+            }))
+            continue
+        try:
+            manager.subscribe(room_uuid, websocket)
+        except ConnectionLimitError as e:
+            await websocket.send_text(json.dumps({
+                "type": "subscribe_error",
+                "room_uuid": room_uuid,
+                "detail": str(e),
+            }))
+            continue
+        subscribed.append(room_uuid)
+
+    results = await get_vote_results_bulk(subscribed)
+    for room_uuid in subscribed:
         await websocket.send_text(json.dumps({
             "type": "initial_results",
-            "results": results
+            "room_uuid": room_uuid,
+            "results": results[room_uuid],
         }))
+        schedule_close(room_uuid, rooms[room_uuid])
+
+
+@router.websocket("/ws/rooms")
+async def multiplexed_websocket_endpoint(websocket: WebSocket):
+    """WebSocket 다중 방 구독
 
+    {"action": "subscribe" | "unsubscribe", "rooms": [...]} 메시지로 구독을 관리하고,
+    모든 갱신 메시지에는 room_uuid가 포함된다.
+    """
+    await websocket.accept()
+
+    try:
+        manager.register(websocket)
+    except ConnectionLimitError as e:
+        await websocket.close(code=WS_CLOSE_TRY_AGAIN_LATER, reason=str(e))
+        return
+    multiplexed_connections.add(websocket)
+
+    try:
         while True:
-            await websocket.receive_text()
+            message = await websocket.receive_text()
+            manager.touch(websocket)
+
+            try:
+                command = json.loads(message)
+            except ValueError:
+                # pong 등 제어 메시지가 아닌 텍스트는 생존 신호로만 사용
+                continue
+            if not isinstance(command, dict):
+                continue
+
+            action = command.get("action")
+            room_uuids = command.get("rooms")
+            if action not in ("subscribe", "unsubscribe"):
+                continue
+            if not isinstance(room_uuids, list) or not all(isinstance(room_uuid, str) for room_uuid in room_uuids):
+                await websocket.send_text(json.dumps({
+                    "type": "error",
+                    "detail": "rooms는 투표방 UUID 목록이어야 합니다",
+                }))
+                continue
+
+            if action == "subscribe":
+                await subscribe_rooms(websocket, room_uuids)
+            else:
+                for room_uuid in room_uuids:
+                    manager.unsubscribe(room_uuid, websocket)
+                release_rooms(room_uuids)
 
     except WebSocketDisconnect:
         pass
     finally:
-        if room_uuid in active_connections:
-            active_connections[room_uuid].discard(websocket)
-            if not active_connections[room_uuid]:
-                del active_connections[room_uuid]
+        subscribed_rooms = list(manager.subscriptions.get(websocket, ()))
+        manager.disconnect(websocket)
+        multiplexed_connections.discard(websocket)
+        release_rooms(subscribed_rooms)
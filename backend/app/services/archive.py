@@ -0,0 +1,208 @@
+import asyncio
+import base64
+import json
+import logging
+import zlib
+from collections.abc import AsyncIterator
+from datetime import datetime, timezone
+
+from app.config import ARCHIVE_BATCH_SIZE, ARCHIVE_INTERVAL, ARCHIVE_MAX_ATTEMPTS
+from app.database import get_redis
+from app.services.list_cache import hot_pages
+from app.services.room import get_room, get_vote_results, is_room_expired
+from app.services.roster import get_roster_view, is_roster_room, roster_keys
+from app.services.vote import voted_key
+
+logger = logging.getLogger(__name__)
+
+# 마감된 방은 방 정보/최종 결과를 하나의 압축 스냅샷으로, 댓글은 압축 묶음 리스트로 보관한다
+ARCHIVE_KEY_PREFIX = "archive:"
+ARCHIVE_COMMENTS_PREFIX = "archive_comments:"
+ARCHIVE_COMMENT_CHUNK_SIZE = 1000
+# 아카이브 실패 횟수와, 계속 실패해 마감 인덱스에서 빼낸 방 (운영자 확인용)
+ARCHIVE_FAILURES_KEY = "rooms:archive_failures"
+ARCHIVE_PARKED_KEY = "rooms:archive_parked"
+# 방별 아카이브 선점 키 (모든 워커가 같은 주기로 같은 배치를 읽으므로 한 워커만 처리)
+ARCHIVE_LOCK_PREFIX = "lock:archive:"
+ARCHIVE_LOCK_TTL = 60
+
+
+def pack_snapshot(snapshot: dict | list) -> str:
+    """스냅샷을 zlib 압축 후 base64 문자열로 변환"""
+    raw = json.dumps(snapshot, ensure_ascii=False, separators=(",", ":")).encode()
+    return base64.b64encode(zlib.compress(raw, 9)).decode("ascii")
+
+
+def unpack_snapshot(payload: str) -> dict | list:
+    """pack_snapshot의 역변환"""
+    return json.loads(zlib.decompress(base64.b64decode(payload)))
+
+
+async def get_archived_room(room_uuid: str) -> dict | None:
+    """아카이브된 방 스냅샷 조회 (room, results, 댓글 묶음 수)"""
+    redis = get_redis()
+    payload = await redis.get(f"{ARCHIVE_KEY_PREFIX}{room_uuid}")
+    if payload:
+        return unpack_snapshot(payload)
+    return None
+
+
+async def iter_archived_comments(room_uuid: str, snapshot: dict) -> AsyncIterator[list[dict]]:
+    """아카이브된 댓글을 압축 묶음 단위로 순회 (한 번에 한 묶음만 메모리에 올림)"""
+    if "comments" in snapshot:
+        # 댓글을 스냅샷에 함께 넣던 이전 아카이브
+        yield snapshot["comments"]
+        return
+    redis = get_redis()
+    for index in range(snapshot.get("comment_chunks", 0)):
+        payload = await redis.lindex(f"{ARCHIVE_COMMENTS_PREFIX}{room_uuid}", index)
+        if payload is None:
+            break
+        yield unpack_snapshot(payload)
+
+
+async def archive_room(room_uuid: str) -> dict | None:
+    """마감된 방을 압축 스냅샷으로 접고 라이브 키와 인덱스를 정리
+
+    방을 먼저 선점한 워커만 처리하며, 다른 워커가 처리 중이면 None을 반환한다.
+    """
+    redis = get_redis()
+    lock_key = f"{ARCHIVE_LOCK_PREFIX}{room_uuid}"
+    if not await redis.set(lock_key, "1", ex=ARCHIVE_LOCK_TTL, nx=True):
+        return None
+    try:
+        return await _archive_room(room_uuid)
+    finally:
+        await redis.unlink(lock_key)
+
+
+async def _archive_room(room_uuid: str) -> dict | None:
+    redis = get_redis()
+    room = await get_room(room_uuid)
+    if not room:
+        # 이미 삭제됐거나 다른 워커가 아카이브한 방은 마감 인덱스에서만 제거
+        await redis.zrem("rooms:expiry", room_uuid)
+        return None
+    if not is_room_expired(room):
+        return None
+
+    ttl = await redis.ttl(f"room:{room_uuid}")
+    live_keys = [
+        f"room:{room_uuid}",
+        f"votes:{room_uuid}",
+        f"comments:{room_uuid}",
+        # 중복 투표 방지 집합도 더 이상 필요 없음
+        voted_key(room_uuid),
+    ]
+
+    # 명단은 마감 시점 상태를 방 정보에 펼쳐서 보관
+    if is_roster_room(room):
+        live_keys.extend(roster_keys(room_uuid, room))
+        room = {**room, **await get_roster_view(room_uuid, room)}
+        room.pop("roster_size")
+        room.pop("restricted_options", None)
+
+    comment_count, comment_chunks = await _archive_comments(room_uuid)
+    snapshot = {
+        "room": room,
+        "results": await get_vote_results(room_uuid),
+        "comment_count": comment_count,
+        "comment_chunks": comment_chunks,
+        "archived_at": datetime.now(timezone.utc).isoformat(),
+    }
+
+    async with redis.pipeline(transaction=True) as pipe:
+        if ttl > 0:
+            # 이미 있는 스냅샷은 덮어쓰지 않음
+            pipe.set(f"{ARCHIVE_KEY_PREFIX}{room_uuid}", pack_snapshot(snapshot), ex=ttl, nx=True)
+            # 투표 이벤트는 스냅샷에 넣지 않고 스냅샷과 같은 기간 동안 스트림으로 남겨 내보내기에 사용
+            pipe.expire(f"vote_events:{room_uuid}", ttl)
+            pipe.expire(f"{ARCHIVE_COMMENTS_PREFIX}{room_uuid}", ttl)
+        else:
+            pipe.unlink(f"vote_events:{room_uuid}", f"{ARCHIVE_COMMENTS_PREFIX}{room_uuid}")
+        pipe.unlink(*live_keys)
+        pipe.zrem("rooms:list", room_uuid)
+        pipe.zrem("rooms:popular", room_uuid)
+        pipe.zrem("rooms:trending", room_uuid)
+        pipe.zrem("rooms:expiry", room_uuid)
+        for tag in room.get("tags", []):
+            pipe.srem(f"rooms:tags:{tag}", room_uuid)
+        await pipe.execute()
+    hot_pages.invalidate()
+    return snapshot
+
+
+async def _archive_comments(room_uuid: str) -> tuple[int, int]:
+    """댓글을 ARCHIVE_COMMENT_CHUNK_SIZE개씩 압축해 리스트로 옮기고 (댓글 수, 묶음 수) 반환"""
+    redis = get_redis()
+    archive_key = f"{ARCHIVE_COMMENTS_PREFIX}{room_uuid}"
+    # 이전에 실패한 시도가 남긴 묶음 정리
+    await redis.unlink(archive_key)
+
+    count = chunks = 0
+    while True:
+        comments_raw = await redis.lrange(
+            f"comments:{room_uuid}", count, count + ARCHIVE_COMMENT_CHUNK_SIZE - 1
+        )
+        if not comments_raw:
+            break
+        await redis.rpush(archive_key, pack_snapshot([json.loads(raw) for raw in comments_raw]))
+        count += len(comments_raw)
+        chunks += 1
+        if len(comments_raw) < ARCHIVE_COMMENT_CHUNK_SIZE:
+            break
+    return count, chunks
+
+
+async def archive_expired_rooms(
+    limit: int = ARCHIVE_BATCH_SIZE,
+    max_attempts: int = ARCHIVE_MAX_ATTEMPTS,
+) -> int:
+    """마감 시각이 지난 방을 아카이브하고 처리한 방 수 반환
+
+    실패한 방은 건너뛰고 다음 주기에 다시 시도하며, max_attempts번 실패하면
+    마감 인덱스에서 빼서 ARCHIVE_PARKED_KEY로 옮긴다.
+    """
+    redis = get_redis()
+    now = datetime.now(timezone.utc).timestamp()
+    room_uuids = await redis.zrangebyscore("rooms:expiry", "-inf", now, start=0, num=limit)
+
+    processed = 0
+    for room_uuid in room_uuids:
+        try:
+            await archive_room(room_uuid)
+        except Exception:
+            logger.exception("방 아카이브 실패: %s", room_uuid)
+            await _record_archive_failure(room_uuid, now, max_attempts)
+            continue
+        # 마감 인덱스는 archive_room이 정리 (다른 워커가 처리 중이면 그 워커가 정리)
+        await redis.hdel(ARCHIVE_FAILURES_KEY, room_uuid)
+        processed += 1
+    return processed
+
+
+async def _record_archive_failure(room_uuid: str, now: float, max_attempts: int) -> None:
+    redis = get_redis()
+    attempts = await redis.hincrby(ARCHIVE_FAILURES_KEY, room_uuid, 1)
+    if attempts < max_attempts:
+        return
+    logger.error("방 아카이브 %d회 실패, 대상에서 제외: %s", attempts, room_uuid)
+    async with redis.pipeline(transaction=True) as pipe:
+        pipe.zrem("rooms:expiry", room_uuid)
+        pipe.zadd(ARCHIVE_PARKED_KEY, {room_uuid: now})
+        pipe.hdel(ARCHIVE_FAILURES_KEY, room_uuid)
+        await pipe.execute()
+
+
+async def run_archiver(interval: float = ARCHIVE_INTERVAL, batch_size: int = ARCHIVE_BATCH_SIZE) -> None:
+    """주기적으로 마감된 방 아카이브
+
+    한 배치를 모두 처리한 경우에만 이어서 처리하므로 실패한 방은 주기마다 한 번만 재시도한다.
+    """
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            while await archive_expired_rooms(batch_size) >= batch_size:
+                pass
+        except Exception:
+            logger.exception("마감된 방 아카이브 실패")
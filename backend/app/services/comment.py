@@ -2,7 +2,7 @@ import json
 import uuid
 from datetime import datetime, timezone
 
-from app.database import get_redis
+from app.database import get_read_redis, get_redis
 
 
 async def create_comment(
@@ -34,9 +34,9 @@ async def create_comment(
     return comment_data
 
 
-async def get_comments(room_uuid: str) -> list[dict]:
+async def get_comments(room_uuid: str, read_replica: bool = False) -> list[dict]:
     """댓글 목록 조회"""
-    redis = get_redis()
+    redis = get_read_redis() if read_replica else get_redis()
     comments_raw = await redis.lrange(f"comments:{room_uuid}", 0, -1)
 
     comments = []
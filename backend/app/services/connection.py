@@ -0,0 +1,208 @@
+import asyncio
+import json
+import time
+
+from fastapi import WebSocket
+
+from app.config import (
+    WS_HEARTBEAT_INTERVAL,
+    WS_IDLE_TIMEOUT,
+    WS_MAX_CONNECTIONS,
+    WS_MAX_CONNECTIONS_PER_ROOM,
+    WS_MAX_SUBSCRIPTIONS,
+    WS_SEND_TIMEOUT,
+)
+from app.services.wire import COMPACT_PING_FRAME, RoomWireState
+
+# 1013: Try Again Later (RFC 6455)
+WS_CLOSE_TRY_AGAIN_LATER = 1013
+# 1001: Going Away
+WS_CLOSE_GOING_AWAY = 1001
+
+PING_MESSAGE = json.dumps({"type": "ping"})
+
+
+class ConnectionLimitError(Exception):
+    """WebSocket 연결 수 제한 초과"""
+
+
+class ConnectionManager:
+    """방별 WebSocket 구독 레지스트리
+
+    연결 하나가 여러 방을 구독할 수 있다 (대시보드용 다중 구독).
+    서버가 주기적으로 ping을 보내고, 유휴 시간 동안 아무 메시지도 보내지 않은
+    연결은 닫아서 살아 있는 클라이언트만 브로드캐스트 대상으로 유지한다.
+    """
+
+    def __init__(
+        self,
+        max_per_room: int = WS_MAX_CONNECTIONS_PER_ROOM,
+        max_total: int = WS_MAX_CONNECTIONS,
+        max_subscriptions: int = WS_MAX_SUBSCRIPTIONS,
+        heartbeat_interval: float = WS_HEARTBEAT_INTERVAL,
+        idle_timeout: float = WS_IDLE_TIMEOUT,
+        send_timeout: float = WS_SEND_TIMEOUT,
+    ):
+        self.max_per_room = max_per_room
+        self.max_total = max_total
+        self.max_subscriptions = max_subscriptions
+        self.heartbeat_interval = heartbeat_interval
+        self.idle_timeout = idle_timeout
+        self.send_timeout = send_timeout
+        self.active_connections: dict[str, set[WebSocket]] = {}
+        self.last_seen: dict[WebSocket, float] = {}
+        self.subscriptions: dict[WebSocket, set[str]] = {}
+        # 압축 프로토콜을 협상한 연결, 아직 스냅샷을 받지 못한 압축 연결, 방별 델타 상태
+        self.compact_connections: set[WebSocket] = set()
+        self.awaiting_snapshot: set[WebSocket] = set()
+        self.wire_states: dict[str, RoomWireState] = {}
+        self._heartbeat_task: asyncio.Task | None = None
+
+    @property
+    def connection_count(self) -> int:
+        return len(self.last_seen)
+
+    def register(self, websocket: WebSocket) -> None:
+        """연결 등록 (워커 연결 수 초과 시 ConnectionLimitError)"""
+        if self.max_total and self.connection_count >= self.max_total:
+            raise ConnectionLimitError("서버 연결 수가 최대치에 도달했습니다")
+        self.last_seen[websocket] = time.monotonic()
+        self.subscriptions[websocket] = set()
+
+    def subscribe(self, room_uuid: str, websocket: WebSocket) -> None:
+        """등록된 연결을 방 구독자로 추가 (방 연결 수 초과 시 ConnectionLimitError)"""
+        room_connections = self.active_connections.get(room_uuid, set())
+        if websocket in room_connections:
+            return
+        if self.max_per_room and len(room_connections) >= self.max_per_room:
+            raise ConnectionLimitError("투표방 연결 수가 최대치에 도달했습니다")
+        if self.max_subscriptions and len(self.subscriptions.get(websocket, ())) >= self.max_subscriptions:
+            raise ConnectionLimitError("구독 가능한 투표방 수를 초과했습니다")
+
+        self.active_connections.setdefault(room_uuid, set()).add(websocket)
+        self.subscriptions.setdefault(websocket, set()).add(room_uuid)
+
+    def unsubscribe(self, room_uuid: str, websocket: WebSocket) -> None:
+        """방 구독 해제 (빈 방 항목은 바로 제거)"""
+        self.subscriptions.get(websocket, set()).discard(room_uuid)
+        room_connections = self.active_connections.get(room_uuid)
+        if room_connections is None:
+            return
+        room_connections.discard(websocket)
+        if not room_connections:
+            del self.active_connections[room_uuid]
+            self.wire_states.pop(room_uuid, None)
+
+    def connect(self, room_uuid: str, websocket: WebSocket) -> None:
+        """단일 방 연결 등록 및 구독"""
+        self.register(websocket)
+        try:
+            self.subscribe(room_uuid, websocket)
+        except ConnectionLimitError:
+            self.disconnect(websocket)
+            raise
+
+    def disconnect(self, websocket: WebSocket) -> None:
+        """연결 해제 (모든 구독 정리)"""
+        self.last_seen.pop(websocket, None)
+        self.compact_connections.discard(websocket)
+        self.awaiting_snapshot.discard(websocket)
+        for room_uuid in self.subscriptions.pop(websocket, set()):
+            self.unsubscribe(room_uuid, websocket)
+
+    def mark_compact(self, websocket: WebSocket) -> None:
+        """압축 프로토콜 연결로 표시 (스냅샷 전송 전까지 델타는 보내지 않음)"""
+        self.compact_connections.add(websocket)
+        self.awaiting_snapshot.add(websocket)
+
+    def snapshot_sent(self, websocket: WebSocket) -> None:
+        """스냅샷 이후 델타 수신 시작"""
+        self.awaiting_snapshot.discard(websocket)
+
+    def touch(self, websocket: WebSocket) -> None:
+        """클라이언트 메시지 수신 시각 갱신"""
+        if websocket in self.last_seen:
+            self.last_seen[websocket] = time.monotonic()
+
+    async def send(self, websocket: WebSocket, message: str) -> bool:
+        """단일 연결 전송 (실패하거나 send_timeout을 넘기면 False)"""
+        try:
+            await asyncio.wait_for(websocket.send_text(message), self.send_timeout)
+        except Exception:
+            return False
+        return True
+
+    async def send_many(self, connections: list[WebSocket], message: str) -> None:
+        """여러 연결에 동시 전송, 전송 실패한 연결은 정리"""
+        sent = await asyncio.gather(*(self.send(connection, message) for connection in connections))
+        for connection, ok in zip(connections, sent):
+            if not ok:
+                self.disconnect(connection)
+                await self._close(connection, WS_CLOSE_GOING_AWAY)
+
+    async def broadcast(self, room_uuid: str, message: str, compact_message: str | None = None) -> None:
+        """방 구독자 전체에 전송 (압축 프로토콜 연결에는 compact_message, 없으면 생략)"""
+        connections = self.active_connections.get(room_uuid, ())
+        legacy = [connection for connection in connections if connection not in self.compact_connections]
+        compact = [
+            connection for connection in connections
+            if connection in self.compact_connections and connection not in self.awaiting_snapshot
+        ]
+        if legacy:
+            await self.send_many(legacy, message)
+        if compact and compact_message is not None:
+            await self.send_many(compact, compact_message)
+
+    async def heartbeat(self) -> None:
+        """유휴 연결을 닫고 나머지 연결에 ping 전송 (구독 방 수와 무관하게 연결당 한 번)"""
+        now = time.monotonic()
+        to_ping: list[WebSocket] = []
+        for connection, last_seen in list(self.last_seen.items()):
+            if now - last_seen > self.idle_timeout:
+                self.disconnect(connection)
+                await self._close(connection, WS_CLOSE_GOING_AWAY, "유휴 연결 종료")
+            else:
+                to_ping.append(connection)
+
+        await self.send_many(
+            [connection for connection in to_ping if connection not in self.compact_connections],
+            PING_MESSAGE,
+        )
+        await self.send_many(
+            [connection for connection in to_ping if connection in self.compact_connections],
+            COMPACT_PING_FRAME,
+        )
+
+    async def _run_heartbeat(self) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            await self.heartbeat()
+
+    def start(self) -> None:
+        if self._heartbeat_task is None and self.heartbeat_interval > 0:
+            self._heartbeat_task = asyncio.create_task(self._run_heartbeat())
+
+    async def stop(self) -> None:
+        if self._heartbeat_task is None:
+            return
+        self._heartbeat_task.cancel()
+        try:
+            await self._heartbeat_task
+        except asyncio.CancelledError:
+            pass
+        self._heartbeat_task = None
+
+    async def close(self, websocket: WebSocket, code: int = 1000, reason: str | None = None) -> None:
+        """연결 해제 후 소켓 종료"""
+        self.disconnect(websocket)
+        await self._close(websocket, code, reason)
+
+    @staticmethod
+    async def _close(websocket: WebSocket, code: int, reason: str | None = None) -> None:
+        try:
+            await websocket.close(code=code, reason=reason)
+        except Exception:
+            pass
+
+
+manager = ConnectionManager()
@@ -0,0 +1,114 @@
+import csv
+import io
+import json
+from collections.abc import AsyncIterator
+from datetime import datetime, timezone
+
+from app.config import EXPORT_CHUNK_SIZE
+from app.database import get_read_redis
+from app.services.archive import iter_archived_comments
+from app.services.room import get_vote_results
+
+CSV_COLUMNS = ["type", "id", "option", "count", "nickname", "content", "created_at"]
+
+
+async def iter_export_records(
+    room_uuid: str,
+    room: dict,
+    snapshot: dict | None = None,
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+) -> AsyncIterator[list[dict]]:
+    """결과, 댓글, 투표 이벤트를 chunk_size 단위 레코드 묶음으로 순회 (복제본에서 읽기)"""
+    redis = get_read_redis()
+
+    results = snapshot["results"] if snapshot else await get_vote_results(room_uuid, read_replica=True)
+    yield [
+        {"type": "result", "option": option, "count": results.get(option, 0)}
+        for option in room["options"]
+    ]
+
+    # 댓글: 아카이브는 압축 묶음 단위, 라이브 방은 LRANGE 구간 단위
+    if snapshot:
+        async for comments in iter_archived_comments(room_uuid, snapshot):
+            for start in range(0, len(comments), chunk_size):
+                yield [_comment_record(comment) for comment in comments[start:start + chunk_size]]
+    else:
+        start = 0
+        while True:
+            comments_raw = await redis.lrange(f"comments:{room_uuid}", start, start + chunk_size - 1)
+            if not comments_raw:
+                break
+            yield [_comment_record(json.loads(comment_raw)) for comment_raw in comments_raw]
+            if len(comments_raw) < chunk_size:
+                break
+            start += chunk_size
+
+    # 투표 이벤트: 기록된 경우에만 XRANGE 커서로 순회 (아카이브된 방도 스트림이 남아 있음)
+    cursor = "-"
+    while True:
+        events = await redis.xrange(f"vote_events:{room_uuid}", min=cursor, max="+", count=chunk_size)
+        if not events:
+            break
+        yield [_vote_record(event_id, fields) for event_id, fields in events]
+        if len(events) < chunk_size:
+            break
+        cursor = f"({events[-1][0]}"
+
+
+def _comment_record(comment: dict) -> dict:
+    return {
+        "type": "comment",
+        "id": comment["id"],
+        "nickname": comment.get("nickname", ""),
+        "content": comment["content"],
+        "created_at": comment["created_at"],
+    }
+
+
+def _vote_record(event_id: str, fields: dict) -> dict:
+    # 스트림 ID 앞부분이 기록 시각(ms)
+    timestamp_ms = int(event_id.split("-")[0])
+    created_at = datetime.fromtimestamp(timestamp_ms / 1000, timezone.utc)
+    return {
+        "type": "vote",
+        "id": event_id,
+        "options": json.loads(fields["options"]),
+        "created_at": created_at.isoformat(),
+    }
+
+
+def format_ndjson(records: list[dict]) -> str:
+    return "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+
+
+def format_csv(records: list[dict]) -> str:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=CSV_COLUMNS, extrasaction="ignore")
+    for record in records:
+        if record["type"] == "vote":
+            # 복수 선택 투표는 선택지마다 한 행
+            for option in record["options"]:
+                writer.writerow({**record, "option": option, "count": 1})
+        else:
+            writer.writerow(record)
+    return buffer.getvalue()
+
+
+async def stream_export(
+    room_uuid: str,
+    room: dict,
+    export_format: str,
+    snapshot: dict | None = None,
+) -> AsyncIterator[str]:
+    """내보내기 본문을 묶음 단위 문자열로 생성 (워커 메모리는 묶음 크기만큼만 사용)"""
+    if export_format == "csv":
+        header = io.StringIO()
+        csv.writer(header).writerow(CSV_COLUMNS)
+        yield header.getvalue()
+        formatter = format_csv
+    else:
+        formatter = format_ndjson
+
+    async for records in iter_export_records(room_uuid, room, snapshot):
+        if records:
+            yield formatter(records)
@@ -0,0 +1,112 @@
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timezone
+
+from app.config import HOT_PAGE_COUNT, HOT_PAGE_MAX_ENTRIES, HOT_PAGE_TTL
+
+CacheKey = tuple[str, str | None, int, int]
+
+
+class HotPageCache:
+    """공개 목록 상위 페이지 캐시
+
+    검색어가 없고 태그가 최대 1개인 앞쪽 페이지만 정렬 기준별로 보관한다.
+    방 생성/투표/마감 시 해당 정렬 기준의 항목을 무효화하고, 그 외에는 짧은 TTL
+    또는 페이지에 포함된 방의 마감 시각 중 이른 쪽까지만 유효하다.
+    같은 키에 대한 동시 미스는 한 번만 계산한다 (singleflight).
+    """
+
+    def __init__(
+        self,
+        ttl: float = HOT_PAGE_TTL,
+        max_page: int = HOT_PAGE_COUNT,
+        max_entries: int = HOT_PAGE_MAX_ENTRIES,
+    ):
+        self.ttl = ttl
+        self.max_page = max_page
+        self.max_entries = max_entries
+        self._entries: dict[CacheKey, tuple[float, dict]] = {}
+        self._inflight: dict[CacheKey, asyncio.Future] = {}
+        self._generations: dict[str, int] = {}
+
+    def cache_key(
+        self,
+        search: str | None,
+        tags: list[str] | None,
+        sort: str,
+        page: int,
+        page_size: int,
+    ) -> CacheKey | None:
+        """캐시 대상 요청이면 키 반환, 아니면 None"""
+        if self.ttl <= 0 or search or page > self.max_page or (tags and len(tags) > 1):
+            return None
+        return (sort, tags[0] if tags else None, page, page_size)
+
+    async def get_or_compute(self, key: CacheKey, compute: Callable[[], Awaitable[dict]]) -> dict:
+        entry = self._entries.get(key)
+        if entry and entry[0] > time.monotonic():
+            return entry[1]
+
+        inflight = self._inflight.get(key)
+        if inflight:
+            try:
+                return await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                # 대기자 자신이 취소된 경우는 전파하고, 계산하던 쪽이 취소된 경우만 직접 계산
+                if not inflight.cancelled():
+                    raise
+            return await self.get_or_compute(key, compute)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        generation = self._generations.get(key[0], 0)
+        try:
+            value = await compute()
+        except Exception as e:
+            future.set_exception(e)
+            # 대기자가 없어도 미확인 예외 경고가 나지 않도록 표시
+            future.exception()
+            raise
+        else:
+            # 계산 도중 무효화되었다면 결과는 돌려주되 보관하지 않음
+            if self._generations.get(key[0], 0) == generation:
+                self._store(key, value)
+            future.set_result(value)
+            return value
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+            # 계산이 취소되면 대기자가 멈추지 않도록 future도 취소
+            if not future.done():
+                future.cancel()
+
+    def invalidate(self, sorts: list[str] | None = None) -> None:
+        """정렬 기준별 캐시 무효화 (None이면 전체)"""
+        if sorts is None:
+            sorts = list({key[0] for key in self._entries} | {key[0] for key in self._inflight})
+        for sort in sorts:
+            self._generations[sort] = self._generations.get(sort, 0) + 1
+        self._entries = {
+            key: entry for key, entry in self._entries.items() if key[0] not in sorts
+        }
+
+    def _store(self, key: CacheKey, value: dict) -> None:
+        now = time.monotonic()
+        deadline = now + self.ttl
+
+        # 페이지의 방이 마감되면 목록이 바뀌므로 그 전에 만료
+        wall_now = datetime.now(timezone.utc)
+        for room in value.get("rooms", []):
+            expires_at = room.get("expires_at")
+            if expires_at:
+                remaining = (datetime.fromisoformat(expires_at) - wall_now).total_seconds()
+                deadline = min(deadline, now + remaining)
+
+        self._entries.pop(key, None)
+        while len(self._entries) >= self.max_entries:
+            self._entries.pop(next(iter(self._entries)))
+        self._entries[key] = (deadline, value)
+
+
+hot_pages = HotPageCache()
@@ -1,13 +1,45 @@
 import json
+import math
 import uuid
 from datetime import datetime, timedelta, timezone
 
-from app.database import get_redis
+from app.config import TRENDING_HALF_LIFE
+from app.database import get_read_redis, get_redis
+from app.services.list_cache import hot_pages
+from app.services.roster import create_roster, restricted_option_indexes
 from app.utils.security import hash_password
 
 # 투표 결과 보관 기간: 만료 후 7일간 생성자가 결과 확인 가능
 RESULT_RETENTION_TTL = 604800  # 7 days in seconds
 
+# 정렬 기준별 인덱스
+SORT_INDEX_KEYS = {
+    "latest": "rooms:list",
+    "popular": "rooms:popular",
+    "trending": "rooms:trending",
+}
+
+# 트렌딩 점수 기준 시각. 점수는 log(Σ exp(λ·(t_i - epoch))) 로 저장하므로
+# 기준 시각을 옮기거나 주기적으로 재계산할 필요가 없다.
+TRENDING_EPOCH = 1_700_000_000
+TRENDING_DECAY_RATE = math.log(2) / TRENDING_HALF_LIFE
+
+# 로그 공간에서 점수를 누적 (logaddexp). 차이가 크면 작은 쪽은 무시한다.
+TRENDING_SCRIPT = """
+local weight = tonumber(ARGV[2])
+local current = tonumber(redis.call('ZSCORE', KEYS[1], ARGV[1]))
+local score = weight
+if current and current > weight - 50 then
+    if current > weight then
+        score = current + math.log(1 + math.exp(weight - current))
+    else
+        score = weight + math.log(1 + math.exp(current - weight))
+    end
+end
+redis.call('ZADD', KEYS[1], score, ARGV[1])
+return tostring(score)
+"""
+
 
 async def create_room(
     title: str,
@@ -29,17 +61,11 @@ async def create_room(
 
     tags = tags or []
     participants = participants or []
-    if participants and option_allowed_participants is None:
-        option_allowed_participants = [participants.copy() for _ in options]
-    option_allowed_participants = option_allowed_participants or []
 
     room_data = {
         "uuid": room_uuid,
         "title": title,
         "options": options,
-        "participants": participants,
-        "remaining_participants": participants.copy(),
-        "option_allowed_participants": option_allowed_participants,
         "created_at": created_at.isoformat(),
         "expires_at": expires_at.isoformat(),
         "has_password": password is not None,
@@ -56,7 +82,16 @@ async def create_room(
         room_data["share_token"] = token_urlsafe(32)
 
     redis_ttl = ttl + RESULT_RETENTION_TTL
+
+    # 제한 투표 명단은 방 JSON이 아닌 별도 키에 저장 (방 크기가 명단 × 선택지로 커지지 않도록)
+    if participants:
+        room_data["roster_size"] = len(participants)
+        room_data["restricted_options"] = restricted_option_indexes(participants, option_allowed_participants)
+
+    # 방 문서를 명단보다 먼저 기록 (점검 도구가 생성 중인 명단을 고아 키로 보지 않도록)
     await redis.setex(f"room:{room_uuid}", redis_ttl, json.dumps(room_data))
+    if participants:
+        await create_roster(room_uuid, participants, option_allowed_participants, redis_ttl)
 
     for option in options:
         await redis.hset(f"votes:{room_uuid}", option, 0)
@@ -68,27 +103,53 @@ async def create_room(
     # 인덱스 추가: 인기순 (초기값 0)
     await redis.zadd("rooms:popular", {room_uuid: 0})
 
+    # 인덱스 추가: 트렌딩 (투표 전에는 -inf, 즉 감쇠 합 0)
+    await redis.zadd("rooms:trending", {room_uuid: float("-inf")})
+
+    # 인덱스 추가: 마감 시각 (아카이브 대상 조회용)
+    await redis.zadd("rooms:expiry", {room_uuid: expires_at.timestamp()})
+
     # 인덱스 추가: 태그별
     for tag in tags:
         await redis.sadd(f"rooms:tags:{tag}", room_uuid)
 
+    hot_pages.invalidate()
+
     response = room_data.copy()
     response.pop("password_hash", None)
     # expose share_token only on create response
     return response
 
 
-async def get_room(room_uuid: str) -> dict | None:
-    """Redis에서 방 정보 조회"""
-    redis = get_redis()
+async def get_room(room_uuid: str, read_replica: bool = False) -> dict | None:
+    """Redis에서 방 정보 조회
+
+    read_replica면 복제본에서 읽고, 아직 복제되지 않은 방은 primary에서 다시 읽는다.
+    """
+    redis = get_read_redis() if read_replica else get_redis()
     room_data = await redis.get(f"room:{room_uuid}")
+    if room_data is None and read_replica:
+        room_data = await get_redis().get(f"room:{room_uuid}")
     if room_data:
         return json.loads(room_data)
     return None
 
 
+async def get_rooms(room_uuids: list[str]) -> dict[str, dict]:
+    """여러 방 정보를 한 번에 조회 (없는 방은 제외)"""
+    if not room_uuids:
+        return {}
+    redis = get_redis()
+    rooms_raw = await redis.mget([f"room:{room_uuid}" for room_uuid in room_uuids])
+    return {
+        room_uuid: json.loads(room_raw)
+        for room_uuid, room_raw in zip(room_uuids, rooms_raw)
+        if room_raw
+    }
+
+
 def get_remaining_participants(room: dict) -> list[str]:
-    """아직 투표하지 않은 제한 투표 참여자 목록"""
+    """아직 투표하지 않은 제한 투표 참여자 목록 (방 JSON에 명단을 저장하던 기존 방)"""
     remaining_participants = room.get("remaining_participants")
     if isinstance(remaining_participants, list):
         return remaining_participants
@@ -104,13 +165,28 @@ def is_room_expired(room: dict) -> bool:
     return expires_at <= datetime.now(timezone.utc)
 
 
-async def get_vote_results(room_uuid: str) -> dict:
+async def get_vote_results(room_uuid: str, read_replica: bool = False) -> dict:
     """투표 결과 조회"""
-    redis = get_redis()
+    redis = get_read_redis() if read_replica else get_redis()
     results = await redis.hgetall(f"votes:{room_uuid}")
     return {k: int(v) for k, v in results.items()}
 
 
+async def get_vote_results_bulk(room_uuids: list[str]) -> dict[str, dict]:
+    """여러 방의 투표 결과를 파이프라인으로 한 번에 조회"""
+    if not room_uuids:
+        return {}
+    redis = get_redis()
+    async with redis.pipeline(transaction=False) as pipe:
+        for room_uuid in room_uuids:
+            pipe.hgetall(f"votes:{room_uuid}")
+        responses = await pipe.execute()
+    return {
+        room_uuid: {k: int(v) for k, v in results.items()}
+        for room_uuid, results in zip(room_uuids, responses)
+    }
+
+
 async def get_room_list(
     search: str | None = None,
     tags: list[str] | None = None,
@@ -118,18 +194,12 @@ async def get_room_list(
     page: int = 1,
     page_size: int = 20
 ) -> dict:
-    """투표방 목록 조회"""
-    redis = get_redis()
+    """투표방 목록 조회 (복제본에서 읽기)"""
+    redis = get_read_redis()
 
-    # 정렬 기준에 따라 인덱스 선택
-    if sort == "popular":
-        index_key = "rooms:popular"
-        # 인기순은 높은 점수부터 (내림차순)
-        room_uuids = await redis.zrevrange(index_key, 0, -1)
-    else:  # latest
-        index_key = "rooms:list"
-        # 최신순은 높은 타임스탬프부터 (내림차순)
-        room_uuids = await redis.zrevrange(index_key, 0, -1)
+    # 정렬 기준에 따라 인덱스 선택 (모두 높은 점수부터, 내림차순)
+    index_key = SORT_INDEX_KEYS.get(sort, SORT_INDEX_KEYS["latest"])
+    room_uuids = await redis.zrevrange(index_key, 0, -1)
 
     # 태그 필터링
     if tags:
@@ -148,7 +218,7 @@ async def get_room_list(
     now = datetime.now(timezone.utc)
 
     for room_uuid in room_uuids:
-        room = await get_room(room_uuid)
+        room = await get_room(room_uuid, read_replica=True)
         if room:
             # expires_at이 지난 방은 공개 목록에서 제외
             expires_at_str = room.get("expires_at")
@@ -204,21 +274,29 @@ async def _cleanup_expired_rooms(expired_uuids: list[str]) -> None:
     for room_uuid in expired_uuids:
         await redis.zrem("rooms:list", room_uuid)
         await redis.zrem("rooms:popular", room_uuid)
+        await redis.zrem("rooms:trending", room_uuid)
+        await redis.zrem("rooms:expiry", room_uuid)
         # 태그 인덱스도 정리해야 하지만, 태그를 모르므로 스킵
         # (방 정보가 이미 삭제되어 태그 정보를 알 수 없음)
 
 
 async def record_room_vote(room_uuid: str, participant: str | None = None) -> None:
     """방의 총 투표수와 제한 투표 남은 참여자 목록 업데이트"""
+    await record_room_votes(room_uuid, 1, [participant] if participant else [])
+
+
+async def record_room_votes(room_uuid: str, count: int, participants: list[str]) -> None:
+    """여러 표를 한 번에 반영 (총 투표수, 남은 참여자, 정렬 인덱스)"""
     redis = get_redis()
     room = await get_room(room_uuid)
     if room:
-        room["total_votes"] = room.get("total_votes", 0) + 1
+        room["total_votes"] = room.get("total_votes", 0) + count
 
-        if participant and room.get("participants"):
+        if participants and room.get("participants"):
+            voted_participants = set(participants)
             remaining_participants = get_remaining_participants(room)
             room["remaining_participants"] = [
-                name for name in remaining_participants if name != participant
+                name for name in remaining_participants if name not in voted_participants
             ]
 
         ttl = await redis.ttl(f"room:{room_uuid}")
@@ -226,6 +304,9 @@ async def record_room_vote(room_uuid: str, participant: str | None = None) -> No
             await redis.setex(f"room:{room_uuid}", ttl, json.dumps(room))
             # 인기순 인덱스 업데이트
             await redis.zadd("rooms:popular", {room_uuid: room["total_votes"]})
+            await update_trending_score(room_uuid, count)
+            # 투표수 기반 정렬 순서가 바뀜
+            hot_pages.invalidate(["popular", "trending"])
 
 
 async def update_room_total_votes(room_uuid: str, increment: int = 1) -> None:
@@ -239,3 +320,18 @@ async def update_room_total_votes(room_uuid: str, increment: int = 1) -> None:
             await redis.setex(f"room:{room_uuid}", ttl, json.dumps(room))
             # 인기순 인덱스 업데이트
             await redis.zadd("rooms:popular", {room_uuid: room["total_votes"]})
+            await update_trending_score(room_uuid, increment)
+
+
+def trending_vote_weight(timestamp: float, count: int = 1) -> float:
+    """timestamp 시각의 투표 count건에 대한 로그 공간 가중치"""
+    return math.log(count) + TRENDING_DECAY_RATE * (timestamp - TRENDING_EPOCH)
+
+
+async def update_trending_score(room_uuid: str, count: int = 1) -> None:
+    """트렌딩 인덱스에 투표 반영 (감쇠 점수를 원자적으로 누적)"""
+    if count <= 0:
+        return
+    redis = get_redis()
+    weight = trending_vote_weight(datetime.now(timezone.utc).timestamp(), count)
+    await redis.eval(TRENDING_SCRIPT, 1, "rooms:trending", room_uuid, weight)
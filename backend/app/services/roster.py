@@ -0,0 +1,187 @@
+from app.database import get_redis
+
+# 제한 투표 참여자 명단은 방 JSON 대신 별도 키에 참여자 ID로 저장한다
+#   roster:{uuid}               hash  이름 -> 참여자 ID (명단 순서)
+#   roster:remaining:{uuid}     set   아직 투표하지 않은 참여자 ID
+#   roster:option:{uuid}:{i}    set   i번 선택지를 고를 수 있는 참여자 ID
+#                                     (전원이 고를 수 있는 선택지는 키 없음)
+
+CLAIM_OK = 1
+CLAIM_UNKNOWN_PARTICIPANT = 0
+CLAIM_ALREADY_VOTED = -1
+CLAIM_OPTION_FORBIDDEN = -2
+
+# 명단 확인, 선택지 권한 확인, 참여자 소진을 한 번에 처리
+# 반환값: {상태 코드, 허용되지 않은 선택지의 KEYS[3..] 내 위치}
+CLAIM_SCRIPT = """
+local id = redis.call('HGET', KEYS[1], ARGV[1])
+if not id then
+    return {0, -1}
+end
+if redis.call('SISMEMBER', KEYS[2], id) == 0 then
+    return {-1, -1}
+end
+for i = 3, #KEYS do
+    if redis.call('SISMEMBER', KEYS[i], id) == 0 then
+        return {-2, i - 3}
+    end
+end
+redis.call('SREM', KEYS[2], id)
+return {1, -1}
+"""
+
+RELEASE_SCRIPT = """
+local id = redis.call('HGET', KEYS[1], ARGV[1])
+if id then
+    redis.call('SADD', KEYS[2], id)
+end
+return id
+"""
+
+
+def is_roster_room(room: dict) -> bool:
+    """참여자 명단을 별도 키로 관리하는 제한 투표인지 확인"""
+    return room.get("roster_size", 0) > 0
+
+
+def restricted_option_indexes(
+    participants: list[str],
+    option_allowed_participants: list[list[str]] | None,
+) -> list[int]:
+    """전원이 아닌 일부 참여자만 고를 수 있는 선택지 인덱스"""
+    if option_allowed_participants is None:
+        return []
+    everyone = set(participants)
+    return [
+        index
+        for index, allowed_participants in enumerate(option_allowed_participants)
+        if set(allowed_participants) != everyone
+    ]
+
+
+def roster_keys(room_uuid: str, room: dict) -> list[str]:
+    """방의 명단 관련 키 전체"""
+    return [
+        f"roster:{room_uuid}",
+        f"roster:remaining:{room_uuid}",
+        *(f"roster:option:{room_uuid}:{index}" for index in room.get("restricted_options", [])),
+    ]
+
+
+async def create_roster(
+    room_uuid: str,
+    participants: list[str],
+    option_allowed_participants: list[list[str]] | None,
+    ttl: int,
+) -> list[int]:
+    """명단 저장 후 제한된 선택지 인덱스 반환"""
+    redis = get_redis()
+    participant_ids = {name: index for index, name in enumerate(participants)}
+    restricted_options = restricted_option_indexes(participants, option_allowed_participants)
+
+    async with redis.pipeline(transaction=True) as pipe:
+        pipe.hset(f"roster:{room_uuid}", mapping=participant_ids)
+        pipe.expire(f"roster:{room_uuid}", ttl)
+        pipe.sadd(f"roster:remaining:{room_uuid}", *participant_ids.values())
+        pipe.expire(f"roster:remaining:{room_uuid}", ttl)
+        for index in restricted_options:
+            allowed_ids = [participant_ids[name] for name in option_allowed_participants[index]]
+            option_key = f"roster:option:{room_uuid}:{index}"
+            if allowed_ids:
+                pipe.sadd(option_key, *allowed_ids)
+                pipe.expire(option_key, ttl)
+        await pipe.execute()
+
+    return restricted_options
+
+
+def _claim_args(room_uuid: str, room: dict, options: list[str]) -> tuple[list[str], list[int]]:
+    restricted_options = set(room.get("restricted_options", []))
+    option_indexes = [
+        index for index in (room["options"].index(option) for option in options)
+        if index in restricted_options
+    ]
+    keys = [
+        f"roster:{room_uuid}",
+        f"roster:remaining:{room_uuid}",
+        *(f"roster:option:{room_uuid}:{index}" for index in option_indexes),
+    ]
+    return keys, option_indexes
+
+
+def _claim_result(response: list, room: dict, option_indexes: list[int]) -> tuple[int, str | None]:
+    status, position = int(response[0]), int(response[1])
+    if status == CLAIM_OPTION_FORBIDDEN:
+        return status, room["options"][option_indexes[position]]
+    return status, None
+
+
+async def claim_participant(
+    room_uuid: str,
+    room: dict,
+    participant: str,
+    options: list[str],
+) -> tuple[int, str | None]:
+    """참여자 검증과 소진을 원자적으로 처리 (상태 코드, 허용되지 않은 선택지)"""
+    redis = get_redis()
+    keys, option_indexes = _claim_args(room_uuid, room, options)
+    response = await redis.eval(CLAIM_SCRIPT, len(keys), *keys, participant)
+    return _claim_result(response, room, option_indexes)
+
+
+async def claim_participants(claims: list[tuple[str, dict, str, list[str]]]) -> list[tuple[int, str | None]]:
+    """claim_participant의 일괄 처리 버전 (room_uuid, room, participant, options 목록)"""
+    if not claims:
+        return []
+    redis = get_redis()
+    claim_args = [
+        _claim_args(room_uuid, room, options) for room_uuid, room, _, options in claims
+    ]
+    async with redis.pipeline(transaction=False) as pipe:
+        for (keys, _), (_, _, participant, _) in zip(claim_args, claims):
+            pipe.eval(CLAIM_SCRIPT, len(keys), *keys, participant)
+        responses = await pipe.execute()
+    return [
+        _claim_result(response, room, option_indexes)
+        for response, (_, room, _, _), (_, option_indexes) in zip(responses, claims, claim_args)
+    ]
+
+
+async def release_participant(room_uuid: str, participant: str) -> None:
+    """소진한 참여자를 되돌림 (투표 기록에 실패한 경우)"""
+    redis = get_redis()
+    await redis.eval(
+        RELEASE_SCRIPT, 2, f"roster:{room_uuid}", f"roster:remaining:{room_uuid}", participant
+    )
+
+
+async def get_roster_view(room_uuid: str, room: dict) -> dict:
+    """클라이언트 표시용 명단 (participants, remaining_participants, option_allowed_participants)
+
+    전원이 고를 수 있는 선택지는 option_allowed_participants에서 None으로 둔다.
+    """
+    redis = get_redis()
+    restricted_options = room.get("restricted_options", [])
+    async with redis.pipeline(transaction=False) as pipe:
+        pipe.hgetall(f"roster:{room_uuid}")
+        pipe.smembers(f"roster:remaining:{room_uuid}")
+        for index in restricted_options:
+            pipe.smembers(f"roster:option:{room_uuid}:{index}")
+        participant_ids, remaining_ids, *option_ids = await pipe.execute()
+
+    names_by_id = {int(participant_id): name for name, participant_id in participant_ids.items()}
+    ordered_ids = sorted(names_by_id)
+
+    def names(ids: set[str]) -> list[str]:
+        members = {int(participant_id) for participant_id in ids}
+        return [names_by_id[participant_id] for participant_id in ordered_ids if participant_id in members]
+
+    option_allowed_participants = [None] * len(room["options"])
+    for index, ids in zip(restricted_options, option_ids):
+        option_allowed_participants[index] = names(ids)
+
+    return {
+        "participants": [names_by_id[participant_id] for participant_id in ordered_ids],
+        "remaining_participants": names(remaining_ids),
+        "option_allowed_participants": option_allowed_participants,
+    }
@@ -0,0 +1,86 @@
+import asyncio
+import heapq
+import logging
+import time
+from collections.abc import Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+
+class CloseScheduler:
+    """마감 시각(epoch 초) 기준 타이머 힙
+
+    폴링 없이 가장 이른 마감 시각까지만 대기하고, 더 이른 항목이 추가되면 깨어나
+    대기 시간을 다시 계산한다. 취소된 항목은 힙에서 꺼낼 때 버린다.
+    """
+
+    def __init__(self, on_due: Callable[[str], Awaitable[None]]):
+        self.on_due = on_due
+        self._heap: list[tuple[float, str]] = []
+        self._deadlines: dict[str, float] = {}
+        self._wakeup: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._deadlines
+
+    def schedule(self, key: str, deadline: float) -> None:
+        """key를 deadline에 실행 (이미 예약된 key는 무시)"""
+        if key in self._deadlines:
+            return
+        self._deadlines[key] = deadline
+        heapq.heappush(self._heap, (deadline, key))
+        if self._wakeup is not None and self._heap[0] == (deadline, key):
+            self._wakeup.set()
+
+    def cancel(self, key: str) -> None:
+        self._deadlines.pop(key, None)
+
+    def pop_due(self, now: float) -> list[str]:
+        """now까지 마감된 key 목록 (취소된 항목 제외)"""
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            deadline, key = heapq.heappop(self._heap)
+            if self._deadlines.get(key) == deadline:
+                del self._deadlines[key]
+                due.append(key)
+        return due
+
+    def next_deadline(self) -> float | None:
+        while self._heap and self._deadlines.get(self._heap[0][1]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+        return self._heap[0][0] if self._heap else None
+
+    async def _run(self) -> None:
+        while True:
+            deadline = self.next_deadline()
+            timeout = None if deadline is None else max(0.0, deadline - time.time())
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+                continue
+            except asyncio.TimeoutError:
+                pass
+
+            for key in self.pop_due(time.time()):
+                try:
+                    await self.on_due(key)
+                except Exception:
+                    logger.exception("마감 처리 실패: %s", key)
+
+    def start(self) -> None:
+        if self._task is None:
+            # 이벤트는 실행 중인 루프에 묶이므로 시작 시점에 생성
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._wakeup = None
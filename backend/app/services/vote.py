@@ -1,14 +1,48 @@
+import json
+
+from app.config import VOTE_EVENT_LOG, VOTE_EVENT_MAXLEN
 from app.database import get_redis
 from app.utils.security import generate_vote_hash
-from app.services.room import record_room_vote
+from app.services.room import record_room_vote, record_room_votes
+
+
+# cast_votes 항목별 결과
+VOTE_ACCEPTED = 1
+VOTE_DUPLICATE = 0
+VOTE_ROOM_CLOSED = -1
+
+
+def voted_key(room_uuid: str) -> str:
+    """방별 투표자 해시 집합 키 (방 TTL과 함께 만료, 아카이브 시 한 번에 삭제)"""
+    return f"voted:{room_uuid}"
+
+
+def legacy_voted_key(room_uuid: str, vote_hash: str) -> str:
+    """투표자별 개별 키 (이전 버전에서 만든 방 호환용, 방 TTL로 자연 만료)"""
+    return f"voted:{room_uuid}:{vote_hash}"
+
+
+def queue_vote_event(pipe, room_uuid: str, options: list[str], ttl: int) -> None:
+    """투표 이벤트를 스트림에 기록 (fingerprint/IP는 남기지 않음)"""
+    key = f"vote_events:{room_uuid}"
+    pipe.xadd(
+        key,
+        {"options": json.dumps(options, ensure_ascii=False)},
+        maxlen=VOTE_EVENT_MAXLEN,
+        approximate=True,
+    )
+    pipe.expire(key, ttl)
 
 
 async def has_voted(room_uuid: str, fingerprint: str, ip: str) -> bool:
     """중복 투표 여부 확인"""
     redis = get_redis()
     vote_hash = generate_vote_hash(fingerprint, ip)
-    voted_key = f"voted:{room_uuid}:{vote_hash}"
-    return await redis.exists(voted_key)
+    async with redis.pipeline(transaction=False) as pipe:
+        pipe.sismember(voted_key(room_uuid), vote_hash)
+        pipe.exists(legacy_voted_key(room_uuid, vote_hash))
+        voted, legacy_voted = await pipe.execute()
+    return bool(voted or legacy_voted)
 
 
 async def cast_vote(
@@ -25,12 +59,75 @@ async def cast_vote(
     for option in options:
         await redis.hincrby(f"votes:{room_uuid}", option, 1)
 
-    # 중복 투표 방지 키 설정
+    # 중복 투표 방지 집합에 추가
     vote_hash = generate_vote_hash(fingerprint, ip)
-    voted_key = f"voted:{room_uuid}:{vote_hash}"
     room_ttl = await redis.ttl(f"room:{room_uuid}")
     if room_ttl > 0:
-        await redis.setex(voted_key, room_ttl, "1")
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.sadd(voted_key(room_uuid), vote_hash)
+            pipe.expire(voted_key(room_uuid), room_ttl)
+            if VOTE_EVENT_LOG:
+                queue_vote_event(pipe, room_uuid, options, room_ttl)
+            await pipe.execute()
 
     # 인기순 인덱스 업데이트 및 제한 투표 참여자 소진 처리
     await record_room_vote(room_uuid, participant)
+
+
+async def cast_votes(votes: list[dict], ip: str) -> list[int]:
+    """여러 투표를 파이프라인으로 일괄 기록
+
+    각 투표는 room_uuid, options, fingerprint, participant 키를 가진다.
+    중복 투표 방지 집합에 SADD로 새로 추가된 투표만 집계에 반영하며,
+    항목별 결과(VOTE_ACCEPTED, VOTE_DUPLICATE, 방이 없거나 만료된 경우 VOTE_ROOM_CLOSED)를
+    입력 순서대로 반환한다.
+    """
+    redis = get_redis()
+    room_uuids = list(dict.fromkeys(vote["room_uuid"] for vote in votes))
+
+    async with redis.pipeline(transaction=False) as pipe:
+        for room_uuid in room_uuids:
+            pipe.ttl(f"room:{room_uuid}")
+        room_ttls = dict(zip(room_uuids, await pipe.execute()))
+
+    # 중복 투표 방지 집합에 선점 (이미 투표한 fingerprint는 실패)
+    claimable = [i for i, vote in enumerate(votes) if room_ttls[vote["room_uuid"]] > 0]
+    async with redis.pipeline(transaction=False) as pipe:
+        for i in claimable:
+            vote = votes[i]
+            vote_hash = generate_vote_hash(vote["fingerprint"], ip)
+            pipe.exists(legacy_voted_key(vote["room_uuid"], vote_hash))
+            pipe.sadd(voted_key(vote["room_uuid"]), vote_hash)
+        for room_uuid, ttl in room_ttls.items():
+            if ttl > 0:
+                pipe.expire(voted_key(room_uuid), ttl)
+        responses = await pipe.execute()
+
+    statuses = [VOTE_ROOM_CLOSED] * len(votes)
+    for n, i in enumerate(claimable):
+        legacy_voted, added = responses[2 * n], responses[2 * n + 1]
+        statuses[i] = VOTE_ACCEPTED if added and not legacy_voted else VOTE_DUPLICATE
+    accepted = [status == VOTE_ACCEPTED for status in statuses]
+    if not any(accepted):
+        return statuses
+
+    async with redis.pipeline(transaction=False) as pipe:
+        for vote, ok in zip(votes, accepted):
+            if ok:
+                for option in vote["options"]:
+                    pipe.hincrby(f"votes:{vote['room_uuid']}", option, 1)
+                if VOTE_EVENT_LOG:
+                    queue_vote_event(pipe, vote["room_uuid"], vote["options"], room_ttls[vote["room_uuid"]])
+        await pipe.execute()
+
+    # 방별로 한 번씩 총 투표수/인덱스/제한 투표 참여자 갱신
+    for room_uuid in room_uuids:
+        room_votes = [
+            vote for vote, ok in zip(votes, accepted)
+            if ok and vote["room_uuid"] == room_uuid
+        ]
+        if room_votes:
+            participants = [vote["participant"] for vote in room_votes if vote.get("participant")]
+            await record_room_votes(room_uuid, len(room_votes), participants)
+
+    return statuses
@@ -0,0 +1,46 @@
+import json
+
+# 협상형 압축 프레임 (Sec-WebSocket-Protocol: fastvote.compact.v1)
+#   ["s", seq, [count0, count1, ...]]        전체 스냅샷 (선택지 인덱스 순서)
+#   ["d", seq, [index, delta, index, delta]] 이전 seq 대비 변경분
+#   ["c", seq, [count0, count1, ...]]        투표 마감 (최종 결과, 이후 연결 종료)
+#   ["p"]                                    ping
+# 클라이언트는 seq가 연속되지 않으면 "resync"를 보내 스냅샷을 다시 받는다.
+COMPACT_SUBPROTOCOL = "fastvote.compact.v1"
+COMPACT_PING_FRAME = '["p"]'
+RESYNC_MESSAGE = "resync"
+
+
+def encode_frame(frame: list) -> str:
+    return json.dumps(frame, ensure_ascii=False, separators=(",", ":"))
+
+
+class RoomWireState:
+    """방별 마지막 전송 결과와 시퀀스 번호 (델타 계산용)"""
+
+    def __init__(self, options: list[str], results: dict[str, int]):
+        self.options = options
+        self.seq = 0
+        self.counts = [results.get(option, 0) for option in options]
+
+    def snapshot_frame(self) -> str:
+        return encode_frame(["s", self.seq, self.counts])
+
+    def closed_frame(self, results: dict[str, int]) -> str:
+        self.counts = [results.get(option, 0) for option in self.options]
+        self.seq += 1
+        return encode_frame(["c", self.seq, self.counts])
+
+    def update(self, results: dict[str, int]) -> str | None:
+        """새 결과 반영 후 델타 프레임 반환 (변경 없으면 None)"""
+        counts = [results.get(option, 0) for option in self.options]
+        changes = []
+        for index, (old, new) in enumerate(zip(self.counts, counts)):
+            if old != new:
+                changes.extend((index, new - old))
+        if not changes:
+            return None
+
+        self.seq += 1
+        self.counts = counts
+        return encode_frame(["d", self.seq, changes])
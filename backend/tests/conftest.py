@@ -0,0 +1,234 @@
+import asyncio
+import sys
+import time
+from fnmatch import fnmatchcase
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app import database
+
+
+class FakeCommands:
+    """FakeRedis가 구현하는 명령 (테스트에서 쓰는 것만, decode_responses=True 기준)"""
+
+    # 키 공통
+    def exists(self, *keys):
+        return sum(key in self.all_keys() for key in keys)
+
+    def unlink(self, *keys):
+        removed = 0
+        for key in keys:
+            for store in self.stores():
+                if store.pop(key, None) is not None:
+                    removed += 1
+            self.ttls.pop(key, None)
+        return removed
+
+    delete = unlink
+
+    def ttl(self, key):
+        if key not in self.all_keys():
+            return -2
+        return self.ttls.get(key, -1)
+
+    def expire(self, key, ttl):
+        if key not in self.all_keys():
+            return False
+        self.ttls[key] = ttl
+        return True
+
+    def time(self):
+        now = time.time() if self.clock is None else self.clock
+        seconds = int(now)
+        return seconds, int(round((now - seconds) * 1_000_000))
+
+    def scan(self, cursor=0, match="*", count=None):
+        return 0, sorted(key for key in self.all_keys() if fnmatchcase(key, match))
+
+    # 문자열
+    def get(self, key):
+        return self.strings.get(key)
+
+    def set(self, key, value, ex=None, nx=False):
+        if nx and key in self.all_keys():
+            return None
+        FakeCommands.unlink(self, key)
+        self.strings[key] = str(value)
+        if ex:
+            self.ttls[key] = ex
+        return True
+
+    def setex(self, key, ttl, value):
+        return FakeCommands.set(self, key, value, ex=ttl)
+
+    # 해시
+    def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+    def hset(self, key, field=None, value=None, mapping=None):
+        fields = dict(mapping or {})
+        if field is not None:
+            fields[field] = value
+        target = self.hashes.setdefault(key, {})
+        added = sum(name not in target for name in fields)
+        target.update({name: str(item) for name, item in fields.items()})
+        return added
+
+    def hincrby(self, key, field, amount=1):
+        target = self.hashes.setdefault(key, {})
+        target[field] = str(int(target.get(field, 0)) + amount)
+        return int(target[field])
+
+    def hdel(self, key, *fields):
+        target = self.hashes.get(key, {})
+        removed = sum(target.pop(field, None) is not None for field in fields)
+        self._drop_if_empty(self.hashes, key)
+        return removed
+
+    # 집합
+    def sadd(self, key, *members):
+        target = self.sets.setdefault(key, set())
+        added = {str(member) for member in members} - target
+        target.update(added)
+        return len(added)
+
+    def srem(self, key, *members):
+        target = self.sets.get(key, set())
+        removed = target & {str(member) for member in members}
+        target -= removed
+        self._drop_if_empty(self.sets, key)
+        return len(removed)
+
+    def sismember(self, key, member):
+        return str(member) in self.sets.get(key, set())
+
+    def smembers(self, key):
+        return set(self.sets.get(key, set()))
+
+    def sscan(self, key, cursor=0, count=None):
+        return 0, sorted(self.sets.get(key, set()))
+
+    # 정렬 집합
+    def zadd(self, key, mapping):
+        target = self.zsets.setdefault(key, {})
+        added = sum(member not in target for member in mapping)
+        target.update(mapping)
+        return added
+
+    def zrem(self, key, *members):
+        target = self.zsets.get(key, {})
+        removed = sum(target.pop(member, None) is not None for member in members)
+        self._drop_if_empty(self.zsets, key)
+        return removed
+
+    def zscore(self, key, member):
+        return self.zsets.get(key, {}).get(member)
+
+    def zrangebyscore(self, key, min, max, start=None, num=None):
+        target = self.zsets.get(key, {})
+        low, high = float(min), float(max)
+        members = sorted((score, member) for member, score in target.items() if low <= score <= high)
+        members = [member for _, member in members]
+        if start is not None:
+            members = members[start:start + num]
+        return members
+
+    def zscan(self, key, cursor=0, count=None):
+        return 0, list(self.zsets.get(key, {}).items())
+
+    # 리스트
+    def rpush(self, key, *values):
+        target = self.lists.setdefault(key, [])
+        target.extend(values)
+        return len(target)
+
+    def lindex(self, key, index):
+        target = self.lists.get(key, [])
+        return target[index] if -len(target) <= index < len(target) else None
+
+    def lrange(self, key, start, end):
+        target = self.lists.get(key, [])
+        return target[start:] if end == -1 else target[start:end + 1]
+
+
+class FakePipeline:
+    """명령을 모아 두었다가 execute 시점에 한 번에 실행 (MULTI/EXEC처럼 중간에 끼어들 수 없음)"""
+
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def __getattr__(self, name):
+        command = getattr(FakeCommands, name)
+
+        def queue(*args, **kwargs):
+            self.commands.append((command, args, kwargs))
+            return self
+        return queue
+
+    async def execute(self):
+        await asyncio.sleep(0)
+        commands, self.commands = self.commands, []
+        return [command(self.redis, *args, **kwargs) for command, args, kwargs in commands]
+
+
+class FakeRedis:
+    """테스트용 인메모리 Redis
+
+    자료형별 저장소(strings, hashes, sets, zsets, lists, streams)를 직접 채우거나 확인할 수 있다.
+    """
+
+    def __init__(self):
+        self.strings = {}
+        self.hashes = {}
+        self.sets = {}
+        self.zsets = {}
+        self.lists = {}
+        self.streams = {}
+        self.ttls = {}
+        # TIME 명령이 돌려줄 시각 (None이면 현재 시각)
+        self.clock = None
+
+    def stores(self):
+        return (self.strings, self.hashes, self.sets, self.zsets, self.lists, self.streams)
+
+    def all_keys(self):
+        return set().union(*self.stores())
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    @staticmethod
+    def _drop_if_empty(store, key):
+        # 실제 Redis처럼 빈 자료형 키는 사라짐
+        if key in store and not store[key]:
+            del store[key]
+
+    def __getattr__(self, name):
+        command = getattr(FakeCommands, name)
+
+        async def call(*args, **kwargs):
+            # 실제 왕복처럼 다른 태스크가 끼어들 수 있도록 양보
+            await asyncio.sleep(0)
+            return command(self, *args, **kwargs)
+        return call
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    """app.database의 primary 연결을 FakeRedis로 교체 (복제본 없음)"""
+    redis = FakeRedis()
+    monkeypatch.setattr(database, "redis_client", redis)
+    monkeypatch.setattr(database, "replica_clients", [])
+    database.set_healthy_replicas([])
+    yield redis
+    database.set_healthy_replicas([])
@@ -0,0 +1,128 @@
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.main import app
+from app.routers import rooms as rooms_router
+from app.services import archive as archive_service
+from app.services.archive import pack_snapshot, unpack_snapshot
+
+
+SNAPSHOT = {
+    "room": {
+        "uuid": "room-1",
+        "title": "점심 메뉴",
+        "options": ["짜장면", "짬뽕"],
+        "expires_at": "2000-01-01T00:00:00+00:00",
+        "share_token": "token",
+    },
+    "results": {"짜장면": 3, "짬뽕": 1},
+    "comments": [
+        {
+            "id": str(i),
+            "room_uuid": "room-1",
+            "content": "짜장면이 최고",
+            "nickname": "",
+            "created_at": "1999-12-31T23:00:00+00:00",
+        }
+        for i in range(50)
+    ],
+}
+
+
+def test_snapshot_round_trip_is_compressed():
+    payload = pack_snapshot(SNAPSHOT)
+
+    assert unpack_snapshot(payload) == SNAPSHOT
+    assert len(payload) < len(str(SNAPSHOT)) / 4
+
+
+def test_results_for_archived_room_are_served_from_snapshot(monkeypatch):
+    async def fake_get_room(room_uuid, read_replica=False):
+        return None
+
+    async def fake_get_archived_room(room_uuid):
+        return SNAPSHOT
+
+    monkeypatch.setattr(rooms_router, "get_room", fake_get_room)
+    monkeypatch.setattr(rooms_router, "get_archived_room", fake_get_archived_room)
+    client = TestClient(app)
+
+    response = client.get("/api/rooms/room-1/results", params={"share_token": "token", "fingerprint": "a"})
+    assert response.status_code == 200
+    assert response.json()["results"] == {"짜장면": 3, "짬뽕": 1}
+    assert "has_voted" not in response.json()
+
+    assert client.get("/api/rooms/room-1/results").status_code == 410
+    assert len(client.get("/api/rooms/room-1/comments").json()) == 50
+
+
+@pytest.mark.asyncio
+async def test_failing_room_does_not_block_archiving_and_is_parked(monkeypatch, fake_redis):
+    fake_redis.zsets["rooms:expiry"] = {"broken": 1, "room-1": 2, "room-2": 3}
+    archived = []
+
+    async def fake_archive_room(room_uuid):
+        if room_uuid == "broken":
+            raise ValueError("corrupt room")
+        archived.append(room_uuid)
+        await fake_redis.zrem("rooms:expiry", room_uuid)
+
+    monkeypatch.setattr(archive_service, "archive_room", fake_archive_room)
+
+    assert await archive_service.archive_expired_rooms(limit=3, max_attempts=2) == 2
+    assert archived == ["room-1", "room-2"]
+    assert list(fake_redis.zsets["rooms:expiry"]) == ["broken"]
+    assert fake_redis.hashes[archive_service.ARCHIVE_FAILURES_KEY] == {"broken": "1"}
+
+    assert await archive_service.archive_expired_rooms(limit=3, max_attempts=2) == 0
+    assert "rooms:expiry" not in fake_redis.zsets
+    assert list(fake_redis.zsets[archive_service.ARCHIVE_PARKED_KEY]) == ["broken"]
+    assert archive_service.ARCHIVE_FAILURES_KEY not in fake_redis.hashes
+
+
+@pytest.mark.asyncio
+async def test_concurrent_archivers_keep_one_complete_snapshot(fake_redis):
+    room = {**SNAPSHOT["room"], "tags": []}
+    fake_redis.strings["room:room-1"] = json.dumps(room)
+    fake_redis.hashes["votes:room-1"] = {"짜장면": "3", "짬뽕": "1"}
+    fake_redis.lists["comments:room-1"] = [json.dumps(SNAPSHOT["comments"][0])]
+    fake_redis.streams["vote_events:room-1"] = [("1-0", {"options": "[]"})]
+    fake_redis.zsets["rooms:expiry"] = {"room-1": 1}
+    for key in ("room:room-1", "votes:room-1", "comments:room-1", "vote_events:room-1"):
+        fake_redis.ttls[key] = 600
+
+    snapshots = await asyncio.gather(archive_service.archive_room("room-1"), archive_service.archive_room("room-1"))
+
+    assert sum(snapshot is not None for snapshot in snapshots) == 1
+    archived = await archive_service.get_archived_room("room-1")
+    assert archived["results"] == {"짜장면": 3, "짬뽕": 1}
+    assert archived["comment_count"] == 1
+    assert "comments" not in archived
+    assert "vote_events:room-1" in fake_redis.streams
+    assert not {"room:room-1", "comments:room-1", "rooms:expiry"} & fake_redis.all_keys()
+    assert not any(key.startswith(archive_service.ARCHIVE_LOCK_PREFIX) for key in fake_redis.all_keys())
+
+
+@pytest.mark.asyncio
+async def test_archived_comments_are_stored_and_read_in_chunks(monkeypatch, fake_redis):
+    monkeypatch.setattr(archive_service, "ARCHIVE_COMMENT_CHUNK_SIZE", 2)
+    room = {**SNAPSHOT["room"], "tags": []}
+    fake_redis.strings["room:room-1"] = json.dumps(room)
+    fake_redis.lists["comments:room-1"] = [json.dumps(comment) for comment in SNAPSHOT["comments"][:5]]
+    fake_redis.ttls["room:room-1"] = 600
+
+    await archive_service.archive_room("room-1")
+
+    snapshot = await archive_service.get_archived_room("room-1")
+    assert (snapshot["comment_count"], snapshot["comment_chunks"]) == (5, 3)
+    assert fake_redis.ttls["archive_comments:room-1"] == 600
+    chunks = [chunk async for chunk in archive_service.iter_archived_comments("room-1", snapshot)]
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+    assert [comment["id"] for chunk in chunks for comment in chunk] == ["0", "1", "2", "3", "4"]
@@ -0,0 +1,138 @@
+import sys
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.main import app
+from app.routers import rooms as rooms_router
+from app.services import vote as vote_service
+from app.utils.security import generate_vote_hash
+
+
+ROOM = {
+    "uuid": "room-1",
+    "title": "점심 메뉴",
+    "options": ["짜장면", "짬뽕"],
+    "expires_at": "2999-01-01T00:00:00+00:00",
+}
+BATCH_HEADERS = {"X-Batch-Token": "kiosk-token"}
+
+
+def test_vote_batch_reports_per_item_results_and_broadcasts_once(monkeypatch):
+    cast_calls = []
+    broadcasts = []
+
+    async def fake_get_rooms(room_uuids):
+        return {"room-1": ROOM}
+
+    async def fake_cast_votes(votes, ip):
+        cast_calls.append(votes)
+        return [vote_service.VOTE_ACCEPTED] * len(votes)
+
+    async def fake_broadcast(room_uuid):
+        broadcasts.append(room_uuid)
+
+    monkeypatch.setattr(rooms_router, "BATCH_VOTE_TOKENS", ["kiosk-token"])
+    monkeypatch.setattr(rooms_router, "get_rooms", fake_get_rooms)
+    monkeypatch.setattr(rooms_router, "cast_votes", fake_cast_votes)
+    monkeypatch.setattr(rooms_router, "broadcast_results", fake_broadcast)
+
+    response = TestClient(app).post("/api/rooms/votes/batch", headers=BATCH_HEADERS, json={"votes": [
+        {"room_uuid": "room-1", "options": ["짜장면"], "fingerprint": "a"},
+        {"room_uuid": "room-1", "options": ["짬뽕"], "fingerprint": "b"},
+        {"room_uuid": "room-1", "options": ["짬뽕"], "fingerprint": "a"},
+        {"room_uuid": "room-1", "options": ["탕수육"], "fingerprint": "c"},
+        {"room_uuid": "room-2", "options": ["짜장면"], "fingerprint": "d"},
+    ]})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [result["status_code"] for result in body["results"]] == [200, 200, 409, 400, 404]
+    assert body["accepted"] == 2
+    assert body["rejected"] == 3
+    assert len(cast_calls) == 1 and len(cast_calls[0]) == 2
+    assert broadcasts == ["room-1"]
+
+
+def test_vote_batch_reports_closed_rooms_as_gone(monkeypatch):
+    async def fake_get_rooms(room_uuids):
+        return {"room-1": ROOM}
+
+    async def fake_cast_votes(votes, ip):
+        return [vote_service.VOTE_ROOM_CLOSED, vote_service.VOTE_DUPLICATE]
+
+    async def fake_broadcast(room_uuid):
+        raise AssertionError("nothing was accepted")
+
+    monkeypatch.setattr(rooms_router, "BATCH_VOTE_TOKENS", ["kiosk-token"])
+    monkeypatch.setattr(rooms_router, "get_rooms", fake_get_rooms)
+    monkeypatch.setattr(rooms_router, "cast_votes", fake_cast_votes)
+    monkeypatch.setattr(rooms_router, "broadcast_results", fake_broadcast)
+
+    response = TestClient(app).post("/api/rooms/votes/batch", headers=BATCH_HEADERS, json={"votes": [
+        {"room_uuid": "room-1", "options": ["짜장면"], "fingerprint": "a"},
+        {"room_uuid": "room-1", "options": ["짬뽕"], "fingerprint": "b"},
+    ]})
+
+    results = response.json()["results"]
+    assert [result["status_code"] for result in results] == [410, 409]
+    assert results[0]["detail"] == "투표가 마감되었습니다"
+
+
+def test_vote_batch_rejects_callers_without_a_valid_token(monkeypatch):
+    async def fake_get_rooms(room_uuids):
+        raise AssertionError("unauthorised batches must not touch Redis")
+
+    monkeypatch.setattr(rooms_router, "get_rooms", fake_get_rooms)
+    body = {"votes": [{"room_uuid": "room-1", "options": ["짜장면"], "fingerprint": "a"}]}
+    client = TestClient(app)
+
+    # 토큰이 설정되지 않으면 엔드포인트 비활성화
+    monkeypatch.setattr(rooms_router, "BATCH_VOTE_TOKENS", [])
+    assert client.post("/api/rooms/votes/batch", headers=BATCH_HEADERS, json=body).status_code == 403
+
+    monkeypatch.setattr(rooms_router, "BATCH_VOTE_TOKENS", ["kiosk-token"])
+    assert client.post("/api/rooms/votes/batch", json=body).status_code == 403
+    response = client.post("/api/rooms/votes/batch", headers={"X-Batch-Token": "guess"}, json=body)
+    assert response.status_code == 403
+    assert response.json()["detail"] == "일괄 투표 권한이 없습니다"
+
+
+@pytest.mark.asyncio
+async def test_cast_votes_dedupes_with_per_room_voter_set(monkeypatch, fake_redis):
+    redis = fake_redis
+    redis.strings["room:room-1"] = "{}"
+    redis.ttls["room:room-1"] = 600
+    # 이전 버전에서 만든 개별 중복 방지 키도 인정
+    redis.strings[f"voted:room-1:{generate_vote_hash('old', '1.2.3.4')}"] = "1"
+    recorded = []
+
+    async def fake_record_room_votes(room_uuid, count, participants):
+        recorded.append((room_uuid, count))
+
+    monkeypatch.setattr(vote_service, "record_room_votes", fake_record_room_votes)
+
+    statuses = await vote_service.cast_votes([
+        {"room_uuid": "room-1", "options": ["짜장면"], "fingerprint": "a"},
+        {"room_uuid": "room-1", "options": ["짬뽕"], "fingerprint": "a"},
+        {"room_uuid": "room-1", "options": ["짬뽕"], "fingerprint": "old"},
+        {"room_uuid": "room-2", "options": ["짬뽕"], "fingerprint": "b"},
+    ], "1.2.3.4")
+
+    assert statuses == [
+        vote_service.VOTE_ACCEPTED,
+        vote_service.VOTE_DUPLICATE,
+        vote_service.VOTE_DUPLICATE,
+        vote_service.VOTE_ROOM_CLOSED,
+    ]
+    assert "voted:room-2" not in redis.sets
+    assert redis.sets["voted:room-1"] == {
+        generate_vote_hash("a", "1.2.3.4"),
+        generate_vote_hash("old", "1.2.3.4"),
+    }
+    assert redis.ttls["voted:room-1"] == 600
+    assert redis.hashes["votes:room-1"] == {"짜장면": "1"}
+    assert recorded == [("room-1", 1)]
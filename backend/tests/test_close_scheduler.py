@@ -0,0 +1,59 @@
+import json
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.main import app
+from app.routers import websocket as websocket_router
+from app.services.scheduler import CloseScheduler
+
+
+async def noop(key):
+    pass
+
+
+def test_pop_due_skips_cancelled_and_future_entries():
+    scheduler = CloseScheduler(noop)
+    scheduler.schedule("room-1", 100)
+    scheduler.schedule("room-2", 200)
+    scheduler.schedule("room-3", 300)
+    scheduler.schedule("room-1", 50)
+    scheduler.cancel("room-2")
+
+    assert scheduler.pop_due(250) == ["room-1"]
+    assert scheduler.next_deadline() == 300
+    assert "room-3" in scheduler and "room-1" not in scheduler
+
+
+def test_subscribers_receive_room_closed_and_socket_is_closed(monkeypatch):
+    expires_at = datetime.now(timezone.utc) + timedelta(milliseconds=100)
+
+    async def fake_get_room(room_uuid):
+        return {"uuid": room_uuid, "options": ["찬성", "반대"], "expires_at": expires_at.isoformat()}
+
+    async def fake_get_vote_results(room_uuid):
+        return {"찬성": 2, "반대": 1}
+
+    monkeypatch.setattr(websocket_router, "get_room", fake_get_room)
+    monkeypatch.setattr(websocket_router, "get_vote_results", fake_get_vote_results)
+
+    with TestClient(app) as client:
+        with client.websocket_connect("/ws/rooms/room-1") as websocket:
+            assert json.loads(websocket.receive_text())["type"] == "initial_results"
+            assert json.loads(websocket.receive_text()) == {
+                "type": "room_closed",
+                "room_uuid": "room-1",
+                "results": {"찬성": 2, "반대": 1},
+            }
+            with pytest.raises(WebSocketDisconnect) as exc_info:
+                websocket.receive_text()
+            assert exc_info.value.code == 1000
+
+        assert "room-1" not in websocket_router.manager.active_connections
+        assert "room-1" not in websocket_router.close_scheduler
@@ -0,0 +1,113 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.services.connection import ConnectionLimitError, ConnectionManager
+
+
+class FakeWebSocket:
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.sent = []
+        self.closed_with = None
+
+    async def send_text(self, message: str):
+        if self.fail:
+            raise RuntimeError("connection lost")
+        self.sent.append(message)
+
+    async def close(self, code: int = 1000, reason: str | None = None):
+        self.closed_with = code
+
+
+def test_connect_rejects_when_room_is_full():
+    manager = ConnectionManager(max_per_room=1, max_total=10)
+    manager.connect("room-1", FakeWebSocket())
+
+    with pytest.raises(ConnectionLimitError):
+        manager.connect("room-1", FakeWebSocket())
+
+    manager.connect("room-2", FakeWebSocket())
+    assert manager.connection_count == 2
+
+
+def test_connect_rejects_when_worker_is_full():
+    manager = ConnectionManager(max_per_room=10, max_total=1)
+    manager.connect("room-1", FakeWebSocket())
+
+    with pytest.raises(ConnectionLimitError):
+        manager.connect("room-2", FakeWebSocket())
+
+
+@pytest.mark.asyncio
+async def test_broadcast_drops_failed_connections():
+    manager = ConnectionManager()
+    alive, dead = FakeWebSocket(), FakeWebSocket(fail=True)
+    manager.connect("room-1", alive)
+    manager.connect("room-1", dead)
+
+    await manager.broadcast("room-1", "hello")
+
+    assert alive.sent == ["hello"]
+    assert manager.active_connections["room-1"] == {alive}
+    assert dead not in manager.last_seen
+
+
+@pytest.mark.asyncio
+async def test_heartbeat_reaps_idle_connections_and_pings_the_rest():
+    manager = ConnectionManager(idle_timeout=30)
+    idle, active = FakeWebSocket(), FakeWebSocket()
+    manager.connect("room-1", idle)
+    manager.connect("room-1", active)
+    manager.last_seen[idle] -= 60
+
+    await manager.heartbeat()
+
+    assert idle.closed_with == 1001
+    assert manager.active_connections["room-1"] == {active}
+    assert active.sent == ['{"type": "ping"}']
+
+    manager.disconnect(active)
+    assert "room-1" not in manager.active_connections
+
+
+@pytest.mark.asyncio
+async def test_multi_room_subscription_shares_one_registry_entry():
+    manager = ConnectionManager(max_subscriptions=2)
+    websocket = FakeWebSocket()
+    manager.register(websocket)
+    manager.subscribe("room-1", websocket)
+    manager.subscribe("room-2", websocket)
+
+    with pytest.raises(ConnectionLimitError):
+        manager.subscribe("room-3", websocket)
+
+    await manager.heartbeat()
+    assert websocket.sent == ['{"type": "ping"}']
+
+    manager.unsubscribe("room-1", websocket)
+    assert "room-1" not in manager.active_connections
+
+    manager.disconnect(websocket)
+    assert manager.active_connections == {}
+    assert manager.connection_count == 0
+
+
+@pytest.mark.asyncio
+async def test_broadcast_skips_compact_connections_until_snapshot_is_sent():
+    manager = ConnectionManager()
+    legacy, compact = FakeWebSocket(), FakeWebSocket()
+    manager.connect("room-1", legacy)
+    manager.connect("room-1", compact)
+    manager.mark_compact(compact)
+
+    await manager.broadcast("room-1", "json", '["d",1,[0,1]]')
+    assert legacy.sent == ["json"]
+    assert compact.sent == []
+
+    manager.snapshot_sent(compact)
+    await manager.broadcast("room-1", "json", '["d",2,[0,1]]')
+    assert compact.sent == ['["d",2,[0,1]]']
@@ -0,0 +1,83 @@
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.services import export as export_service
+
+
+ROOM = {"uuid": "room-1", "options": ["짜장면", "짬뽕"]}
+
+
+class FakeRedis:
+    def __init__(self, comments: int, events: int):
+        self.comments = [
+            json.dumps({"id": str(i), "content": f"댓글 {i}", "nickname": "", "created_at": "2026-01-01T00:00:00+00:00"})
+            for i in range(comments)
+        ]
+        self.events = [(f"1767225600000-{i}", {"options": json.dumps(["짬뽕"])}) for i in range(events)]
+        self.calls = []
+
+    async def hgetall(self, key):
+        return {"짜장면": "3", "짬뽕": "2"}
+
+    async def lrange(self, key, start, end):
+        self.calls.append(("lrange", start, end))
+        return self.comments[start:end + 1]
+
+    async def xrange(self, key, min, max, count):
+        self.calls.append(("xrange", min, count))
+        if min == "-":
+            start = 0
+        else:
+            start = [event_id for event_id, _ in self.events].index(min[1:]) + 1
+        return self.events[start:start + count]
+
+
+@pytest.mark.asyncio
+async def test_export_reads_in_bounded_chunks(monkeypatch):
+    redis = FakeRedis(comments=5, events=3)
+    monkeypatch.setattr(export_service, "get_read_redis", lambda: redis)
+    monkeypatch.setattr(export_service, "get_vote_results", lambda room_uuid, read_replica=False: redis.hgetall(room_uuid))
+
+    chunks = [chunk async for chunk in export_service.iter_export_records("room-1", ROOM, chunk_size=2)]
+
+    assert [len(chunk) for chunk in chunks] == [2, 2, 2, 1, 2, 1]
+    assert ("lrange", 4, 5) in redis.calls
+    assert ("xrange", "(1767225600000-1", 2) in redis.calls
+    assert chunks[-1][0]["type"] == "vote"
+    assert chunks[-1][0]["created_at"] == "2026-01-01T00:00:00+00:00"
+
+
+@pytest.mark.asyncio
+async def test_csv_export_writes_one_row_per_record(monkeypatch):
+    redis = FakeRedis(comments=1, events=1)
+    monkeypatch.setattr(export_service, "get_read_redis", lambda: redis)
+    monkeypatch.setattr(export_service, "get_vote_results", lambda room_uuid, read_replica=False: redis.hgetall(room_uuid))
+
+    body = "".join([chunk async for chunk in export_service.stream_export("room-1", ROOM, "csv")])
+
+    lines = body.strip().splitlines()
+    assert lines[0] == "type,id,option,count,nickname,content,created_at"
+    assert lines[1] == "result,,짜장면,3,,,"
+    assert lines[3].startswith("comment,0,,,,댓글 0,")
+    assert lines[4].startswith("vote,1767225600000-0,짬뽕,1,,,")
+
+
+@pytest.mark.asyncio
+async def test_archived_room_export_includes_vote_events(monkeypatch):
+    redis = FakeRedis(comments=0, events=2)
+    monkeypatch.setattr(export_service, "get_read_redis", lambda: redis)
+    snapshot = {"results": {"짜장면": 1}, "comment_count": 0, "comment_chunks": 0}
+
+    records = [
+        record
+        async for chunk in export_service.iter_export_records("room-1", ROOM, snapshot, chunk_size=10)
+        for record in chunk
+    ]
+
+    assert [record["type"] for record in records] == ["result", "result", "vote", "vote"]
+    assert not any(call[0] == "lrange" for call in redis.calls)
@@ -0,0 +1,105 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.services.list_cache import HotPageCache
+
+
+def test_cache_key_only_covers_hot_pages():
+    cache = HotPageCache(ttl=5, max_page=3)
+
+    assert cache.cache_key(None, None, "latest", 1, 20) == ("latest", None, 1, 20)
+    assert cache.cache_key(None, ["음식"], "popular", 2, 20) == ("popular", "음식", 2, 20)
+    assert cache.cache_key("점심", None, "latest", 1, 20) is None
+    assert cache.cache_key(None, None, "latest", 4, 20) is None
+    assert cache.cache_key(None, ["음식", "점심"], "latest", 1, 20) is None
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_compute_once():
+    cache = HotPageCache(ttl=5)
+    calls = 0
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"rooms": [], "total": 0}
+
+    key = ("latest", None, 1, 20)
+    results = await asyncio.gather(*(cache.get_or_compute(key, compute) for _ in range(10)))
+
+    assert calls == 1
+    assert all(result == {"rooms": [], "total": 0} for result in results)
+
+    await cache.get_or_compute(key, compute)
+    assert calls == 1
+
+
+@pytest.mark.asyncio
+async def test_invalidate_drops_only_selected_sort_orders():
+    cache = HotPageCache(ttl=5)
+    calls = []
+
+    def compute_for(sort):
+        async def compute():
+            calls.append(sort)
+            return {"rooms": []}
+        return compute
+
+    for sort in ("latest", "popular"):
+        await cache.get_or_compute((sort, None, 1, 20), compute_for(sort))
+
+    cache.invalidate(["popular"])
+    for sort in ("latest", "popular"):
+        await cache.get_or_compute((sort, None, 1, 20), compute_for(sort))
+
+    assert calls == ["latest", "popular", "popular"]
+
+
+@pytest.mark.asyncio
+async def test_page_expires_when_listed_room_closes():
+    cache = HotPageCache(ttl=60)
+    calls = 0
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        return {"rooms": [{"expires_at": "2000-01-01T00:00:00+00:00"}]}
+
+    key = ("latest", None, 1, 20)
+    await cache.get_or_compute(key, compute)
+    await cache.get_or_compute(key, compute)
+
+    assert calls == 2
+
+
+@pytest.mark.asyncio
+async def test_waiters_recompute_when_leader_is_cancelled():
+    cache = HotPageCache(ttl=5)
+    started = asyncio.Event()
+    calls = 0
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            started.set()
+            await asyncio.sleep(10)
+        return {"rooms": [], "total": calls}
+
+    key = ("latest", None, 1, 20)
+    leader = asyncio.create_task(cache.get_or_compute(key, compute))
+    await started.wait()
+    waiter = asyncio.create_task(cache.get_or_compute(key, compute))
+    await asyncio.sleep(0)
+
+    leader.cancel()
+    result = await asyncio.wait_for(waiter, 1)
+
+    assert result == {"rooms": [], "total": 2}
+    assert key not in cache._inflight
@@ -0,0 +1,133 @@
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app import maintenance
+from app.maintenance import expected_index_entries, room_uuid_from_key
+
+
+ROOM = {
+    "uuid": "room-1",
+    "created_at": "2026-01-01T00:00:00+00:00",
+    "expires_at": "2026-01-01T01:00:00+00:00",
+    "total_votes": 0,
+    "tags": ["음식"],
+}
+
+
+def fill_redis(redis):
+    redis.strings["room:room-1"] = json.dumps(ROOM)
+    expected = expected_index_entries(ROOM)
+    # rooms:popular 누락, rooms:list 점수 불일치, 태그 인덱스 누락
+    redis.zsets.update({
+        "rooms:list": {"room-1": 0.0, "gone": 1.0},
+        "rooms:trending": {"room-1": expected["rooms:trending"]},
+        "rooms:expiry": {"room-1": expected["rooms:expiry"]},
+    })
+    redis.sets.update({"rooms:tags:점심": {"gone"}, "roster:remaining:gone": {"0"}})
+    redis.hashes.update({"votes:room-1": {"짜장면": "1"}, "votes:gone": {"짜장면": "1"}, "roster:gone": {"김철수": "0"}})
+    redis.streams["vote_events:archived"] = [("1-0", {"options": "[]"})]
+    redis.strings["archive:archived"] = "snapshot"
+    return redis
+
+
+def test_room_uuid_from_data_keys():
+    assert room_uuid_from_key("votes:room-1") == "room-1"
+    assert room_uuid_from_key("voted:room-1") == "room-1"
+    assert room_uuid_from_key("comments:room-1") == "room-1"
+    assert room_uuid_from_key("vote_events:room-1") == "room-1"
+    assert room_uuid_from_key("roster:room-1") == "room-1"
+    assert room_uuid_from_key("roster:remaining:room-1") == "room-1"
+    assert room_uuid_from_key("roster:option:room-1:2") == "room-1"
+    assert room_uuid_from_key("rooms:list") is None
+
+
+def test_expected_index_entries_follow_room_document():
+    room = {
+        "uuid": "room-1",
+        "created_at": "2026-01-01T00:00:00+00:00",
+        "expires_at": "2026-01-01T01:00:00+00:00",
+        "total_votes": 0,
+    }
+
+    expected = expected_index_entries(room)
+
+    assert expected["rooms:list"] == 1767225600.0
+    assert expected["rooms:expiry"] == 1767229200.0
+    assert expected["rooms:popular"] == 0
+    assert expected["rooms:trending"] == float("-inf")
+
+    room["total_votes"] = 4
+    assert expected_index_entries(room)["rooms:trending"] > 0
+
+
+@pytest.mark.asyncio
+async def test_report_only_run_counts_problems_without_writing(fake_redis):
+    redis = fill_redis(fake_redis)
+    keys = redis.all_keys()
+
+    report = await maintenance.run(repair=False, rate=0)
+
+    assert report["rooms"] == 1
+    assert report["missing"]["rooms:popular"] == 1
+    assert report["missing"]["rooms:tags:*"] == 1
+    assert report["mismatched"]["rooms:list"] == 1
+    assert report["orphan_members"]["rooms:list"] == 1
+    assert report["orphan_members"]["rooms:tags:*"] == 1
+    assert report["orphan_keys"] == 3
+    assert redis.all_keys() == keys
+    assert redis.zsets["rooms:list"] == {"room-1": 0.0, "gone": 1.0}
+
+
+@pytest.mark.asyncio
+async def test_repair_run_fixes_indexes_and_removes_orphans(fake_redis):
+    redis = fill_redis(fake_redis)
+
+    report = await maintenance.run(repair=True, rate=0, grace=0)
+
+    expected = expected_index_entries(ROOM)
+    assert report["orphan_keys"] == 3
+    assert redis.zsets["rooms:list"] == {"room-1": expected["rooms:list"]}
+    assert redis.zsets["rooms:popular"] == {"room-1": 0}
+    assert redis.sets["rooms:tags:음식"] == {"room-1"}
+    assert "rooms:tags:점심" not in redis.sets
+    # 라이브 방의 데이터와 아카이브된 방의 이벤트 스트림은 유지
+    assert "votes:room-1" in redis.hashes
+    assert "vote_events:archived" in redis.streams
+    assert not {"votes:gone", "roster:gone", "roster:remaining:gone"} & redis.all_keys()
+
+
+@pytest.mark.asyncio
+async def test_repair_keeps_keys_of_room_created_during_grace(monkeypatch, fake_redis):
+    redis = fake_redis
+    redis.hashes["roster:new"] = {"김철수": "0"}
+    redis.sets["roster:remaining:new"] = {"0"}
+
+    async def fake_sleep(seconds):
+        # 명단 기록 직후 방 문서 기록이 끝난 상황
+        redis.strings["room:new"] = json.dumps({**ROOM, "uuid": "new"})
+
+    monkeypatch.setattr(maintenance.asyncio, "sleep", fake_sleep)
+    report = {"orphan_keys": 0}
+
+    await maintenance.find_orphan_data_keys(redis, 100, maintenance.RateLimiter(0), True, report, grace=5)
+
+    assert report["orphan_keys"] == 0
+    assert redis.all_keys() == {"room:new", "roster:new", "roster:remaining:new"}
+
+
+@pytest.mark.asyncio
+async def test_parked_room_is_reported_and_not_reindexed_for_expiry(fake_redis):
+    redis = fill_redis(fake_redis)
+    del redis.zsets["rooms:expiry"]
+    redis.zsets["rooms:archive_parked"] = {"room-1": 1767229200.0}
+
+    report = await maintenance.run(repair=True, rate=0, grace=0)
+
+    assert report["parked"] == 1
+    assert report["missing"]["rooms:expiry"] == 0
+    assert "rooms:expiry" not in redis.zsets
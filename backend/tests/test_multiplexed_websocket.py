@@ -0,0 +1,71 @@
+import json
+import sys
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.main import app
+from app.routers import websocket as websocket_router
+
+
+def test_multiplexed_subscribe_sends_tagged_snapshots(monkeypatch):
+    fetched = []
+
+    async def fake_get_rooms(room_uuids):
+        return {room_uuid: {"uuid": room_uuid} for room_uuid in room_uuids if room_uuid != "missing"}
+
+    async def fake_get_vote_results_bulk(room_uuids):
+        fetched.append(room_uuids)
+        return {room_uuid: {"찬성": index} for index, room_uuid in enumerate(room_uuids)}
+
+    monkeypatch.setattr(websocket_router, "get_rooms", fake_get_rooms)
+    monkeypatch.setattr(websocket_router, "get_vote_results_bulk", fake_get_vote_results_bulk)
+
+    with TestClient(app).websocket_connect("/ws/rooms") as websocket:
+        websocket.send_text(json.dumps({"action": "subscribe", "rooms": ["room-1", "missing", "room-2"]}))
+
+        messages = [json.loads(websocket.receive_text()) for _ in range(3)]
+
+        assert messages[0] == {"type": "subscribe_error", "room_uuid": "missing", "detail": "투표방을 찾을 수 없습니다"}
+        assert messages[1] == {"type": "initial_results", "room_uuid": "room-1", "results": {"찬성": 0}}
+        assert messages[2] == {"type": "initial_results", "room_uuid": "room-2", "results": {"찬성": 1}}
+        assert fetched == [["room-1", "room-2"]]
+        assert websocket_router.manager.active_connections.keys() == {"room-1", "room-2"}
+
+        websocket.send_text(json.dumps({"action": "unsubscribe", "rooms": ["room-1"]}))
+        websocket.send_text("pong")
+        websocket.close()
+
+    assert "room-1" not in websocket_router.manager.active_connections
+
+
+def test_multiplexed_subscribe_caps_rooms_before_lookup(monkeypatch):
+    fetched = []
+
+    async def fake_get_rooms(room_uuids):
+        fetched.append(room_uuids)
+        return {room_uuid: {"uuid": room_uuid} for room_uuid in room_uuids}
+
+    async def fake_get_vote_results_bulk(room_uuids):
+        return {room_uuid: {} for room_uuid in room_uuids}
+
+    monkeypatch.setattr(websocket_router, "get_rooms", fake_get_rooms)
+    monkeypatch.setattr(websocket_router, "get_vote_results_bulk", fake_get_vote_results_bulk)
+    monkeypatch.setattr(websocket_router.manager, "max_subscriptions", 2)
+
+    with TestClient(app).websocket_connect("/ws/rooms") as websocket:
+        websocket.send_text(json.dumps({"action": "subscribe", "rooms": [f"room-{i}" for i in range(1000)]}))
+
+        messages = [json.loads(websocket.receive_text()) for _ in range(3)]
+
+        assert messages[0] == {"type": "subscribe_error", "rejected": 998, "detail": "구독 가능한 투표방 수를 초과했습니다"}
+        assert [message["room_uuid"] for message in messages[1:]] == ["room-0", "room-1"]
+        assert fetched == [["room-0", "room-1"]]
+
+        websocket.send_text(json.dumps({"action": "subscribe", "rooms": ["room-2"]}))
+        assert json.loads(websocket.receive_text())["rejected"] == 1
+        websocket.close()
+
+    assert fetched == [["room-0", "room-1"]]
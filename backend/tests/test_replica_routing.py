@@ -0,0 +1,58 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app import database
+from app.services import room as room_service
+from conftest import FakeRedis
+
+
+@pytest.fixture(autouse=True)
+def primary(fake_redis):
+    return fake_redis
+
+
+def replica_with_heartbeat(heartbeat: float | None = None) -> FakeRedis:
+    replica = FakeRedis()
+    if heartbeat is not None:
+        replica.strings[database.REPLICA_HEARTBEAT_KEY] = str(heartbeat)
+    return replica
+
+
+def test_read_redis_falls_back_to_primary_without_healthy_replicas():
+    assert database.get_read_redis() is database.redis_client
+
+
+def test_read_redis_round_robins_over_healthy_replicas():
+    first, second = FakeRedis(), FakeRedis()
+    database.set_healthy_replicas([first, second])
+
+    assert [database.get_read_redis() for _ in range(3)] == [first, second, first]
+
+
+@pytest.mark.asyncio
+async def test_check_replicas_excludes_lagging_and_missing_replicas(monkeypatch, primary):
+    # 하트비트와 현재 시각 모두 primary의 TIME 기준 (워커 시계와 크게 달라도 영향 없음)
+    primary.clock = 1_000_000.25
+    fresh = replica_with_heartbeat(1_000_000.25 - 1.5)
+    lagging = replica_with_heartbeat(1_000_000.25 - 10)
+    empty = replica_with_heartbeat()
+    monkeypatch.setattr(database, "replica_clients", [fresh, lagging, empty])
+
+    await database.check_replicas(max_lag=2.0, interval=1.0)
+
+    assert database.healthy_replicas == [fresh]
+    assert float(primary.strings[database.REPLICA_HEARTBEAT_KEY]) == 1_000_000.25
+
+
+@pytest.mark.asyncio
+async def test_get_room_rereads_primary_when_replica_has_not_caught_up(primary):
+    primary.strings["room:room-1"] = '{"uuid": "room-1", "title": "점심"}'
+    database.set_healthy_replicas([FakeRedis()])
+
+    room = await room_service.get_room("room-1", read_replica=True)
+
+    assert room["title"] == "점심"
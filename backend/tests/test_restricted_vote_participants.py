@@ -28,6 +28,10 @@ class FakeRedis:
     async def zadd(self, key: str, mapping: dict):
         self.zsets[key] = mapping
 
+    async def eval(self, script: str, numkeys: int, *args):
+        key, member, weight = args
+        self.zsets.setdefault(key, {})[member] = weight
+
 
 def test_get_remaining_participants_falls_back_to_original_list():
     room = {"participants": ["김철수", "이영희"]}
@@ -53,3 +57,4 @@ async def test_record_room_vote_removes_participant_from_remaining_list(monkeypa
     assert saved_room["remaining_participants"] == ["이영희"]
     assert saved_room["total_votes"] == 1
     assert redis.zsets["rooms:popular"] == {"room-1": 1}
+    assert "room-1" in redis.zsets["rooms:trending"]
@@ -0,0 +1,72 @@
+import sys
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.main import app
+from app.routers import rooms as rooms_router
+from app.services import roster as roster_service
+
+
+ROOM = {
+    "uuid": "room-1",
+    "title": "회식 장소",
+    "options": ["고기", "회", "파스타"],
+    "expires_at": "2999-01-01T00:00:00+00:00",
+    "roster_size": 3,
+    "restricted_options": [1],
+}
+
+
+def test_restricted_option_indexes_skips_options_open_to_everyone():
+    participants = ["김철수", "이영희", "박민수"]
+    allowed = [["박민수", "김철수", "이영희"], ["이영희"], participants]
+
+    assert roster_service.restricted_option_indexes(participants, allowed) == [1]
+    assert roster_service.restricted_option_indexes(participants, None) == []
+
+
+@pytest.mark.asyncio
+async def test_get_roster_view_keeps_roster_order(fake_redis):
+    fake_redis.hashes["roster:room-1"] = {"김철수": "0", "이영희": "1", "박민수": "2"}
+    fake_redis.sets.update({
+        "roster:remaining:room-1": {"0", "2"},
+        "roster:option:room-1:1": {"1", "2"},
+    })
+
+    view = await roster_service.get_roster_view("room-1", ROOM)
+
+    assert view["participants"] == ["김철수", "이영희", "박민수"]
+    assert view["remaining_participants"] == ["김철수", "박민수"]
+    assert view["option_allowed_participants"] == [None, ["이영희", "박민수"], None]
+
+
+def test_vote_rejects_forbidden_option_from_roster_claim(monkeypatch):
+    claims = []
+
+    async def fake_get_room(room_uuid):
+        return ROOM
+
+    async def fake_has_voted(room_uuid, fingerprint, ip):
+        return False
+
+    async def fake_claim(room_uuid, room, participant, options):
+        claims.append((participant, options))
+        return roster_service.CLAIM_OPTION_FORBIDDEN, "회"
+
+    monkeypatch.setattr(rooms_router, "get_room", fake_get_room)
+    monkeypatch.setattr(rooms_router, "has_voted", fake_has_voted)
+    monkeypatch.setattr(rooms_router, "claim_participant", fake_claim)
+
+    response = TestClient(app).post("/api/rooms/room-1/vote", json={
+        "options": ["회"],
+        "fingerprint": "a",
+        "participant": "김철수",
+    })
+
+    assert response.status_code == 403
+    assert response.json()["detail"] == "김철수님은 선택할 수 없는 옵션입니다: 회"
+    assert claims == [("김철수", ["회"])]
@@ -0,0 +1,32 @@
+import math
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.services import room as room_service
+
+
+def test_trending_weight_halves_after_half_life():
+    now = room_service.TRENDING_EPOCH + 86400
+    later = now + room_service.TRENDING_HALF_LIFE
+
+    # 같은 점수 체계에서 한 반감기 뒤의 투표는 두 배의 가중치를 가진다
+    diff = room_service.trending_vote_weight(later) - room_service.trending_vote_weight(now)
+    assert math.isclose(diff, math.log(2))
+
+
+def test_trending_weight_counts_batched_votes_in_log_space():
+    timestamp = room_service.TRENDING_EPOCH + 3600
+    single = room_service.trending_vote_weight(timestamp)
+
+    assert math.isclose(room_service.trending_vote_weight(timestamp, 3), single + math.log(3))
+
+
+def test_recent_votes_outrank_older_burst():
+    old_burst = room_service.trending_vote_weight(room_service.TRENDING_EPOCH, 100)
+    recent = room_service.trending_vote_weight(
+        room_service.TRENDING_EPOCH + 8 * room_service.TRENDING_HALF_LIFE, 1
+    )
+
+    assert recent > old_burst
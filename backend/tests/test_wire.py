@@ -0,0 +1,54 @@
+import json
+import sys
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.main import app
+from app.routers import websocket as websocket_router
+from app.services.wire import COMPACT_SUBPROTOCOL, RoomWireState
+
+
+def test_wire_state_sends_index_deltas():
+    state = RoomWireState(["짜장면", "짬뽕", "탕수육"], {"짜장면": 3, "짬뽕": 1})
+
+    assert state.snapshot_frame() == '["s",0,[3,1,0]]'
+    assert state.update({"짜장면": 3, "짬뽕": 2, "탕수육": 0}) == '["d",1,[1,1]]'
+    assert state.update({"짜장면": 3, "짬뽕": 2, "탕수육": 0}) is None
+    assert state.update({"짜장면": 5, "짬뽕": 2, "탕수육": 1}) == '["d",2,[0,2,2,1]]'
+    assert state.snapshot_frame() == '["s",2,[5,2,1]]'
+
+
+def test_websocket_negotiates_compact_protocol(monkeypatch):
+    results = {"찬성": 1, "반대": 0}
+
+    async def fake_get_room(room_uuid):
+        return {"uuid": room_uuid, "options": ["찬성", "반대"]}
+
+    async def fake_get_vote_results(room_uuid):
+        return dict(results)
+
+    monkeypatch.setattr(websocket_router, "get_room", fake_get_room)
+    monkeypatch.setattr(websocket_router, "get_vote_results", fake_get_vote_results)
+
+    with TestClient(app) as client:
+        with client.websocket_connect("/ws/rooms/room-1", subprotocols=[COMPACT_SUBPROTOCOL]) as first:
+            assert first.accepted_subprotocol == COMPACT_SUBPROTOCOL
+            assert first.receive_text() == '["s",0,[1,0]]'
+
+            with client.websocket_connect("/ws/rooms/room-1") as legacy:
+                assert legacy.accepted_subprotocol is None
+                assert json.loads(legacy.receive_text())["type"] == "initial_results"
+
+            # 새 구독자가 최신 결과를 가져오면 기존 구독자는 델타만 받는다
+            results["반대"] = 1
+            with client.websocket_connect("/ws/rooms/room-1", subprotocols=[COMPACT_SUBPROTOCOL]) as second:
+                assert second.receive_text() == '["s",1,[1,1]]'
+                assert first.receive_text() == '["d",1,[1,1]]'
+
+            first.send_text("resync")
+            assert first.receive_text() == '["s",1,[1,1]]'
+
+    assert "room-1" not in websocket_router.manager.wire_states
@@ -23,7 +23,8 @@ export default async function PollsPage({ searchParams }: PollsPageProps) {
 
   const params = await searchParams;
   const search = typeof params?.search === "string" ? params.search : "";
-  const sort = params?.sort === "popular" ? "popular" : "latest";
+  const sort =
+    params?.sort === "popular" ? "popular" : params?.sort === "trending" ? "trending" : "latest";
   const selectedTag = typeof params?.tag === "string" ? params.tag : "";
 
   let rooms: RoomSummary[] = [];
@@ -79,6 +80,7 @@ export default async function PollsPage({ searchParams }: PollsPageProps) {
               searchPlaceholder: t.searchPlaceholder,
               sortLatest: t.sortLatest,
               sortPopular: t.sortPopular,
+              sortTrending: t.sortTrending,
             }}
           />
         </div>
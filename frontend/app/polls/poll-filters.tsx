@@ -6,11 +6,12 @@ import { Search, SlidersHorizontal } from "lucide-react";
 
 type PollFiltersProps = {
   search: string;
-  sort: "latest" | "popular";
+  sort: "latest" | "popular" | "trending";
   labels: {
     searchPlaceholder: string;
     sortLatest: string;
     sortPopular: string;
+    sortTrending: string;
   };
 };
 
@@ -29,7 +30,7 @@ export default function PollFilters({ search, sort, labels }: PollFiltersProps)
     setCurrentSort(sort);
   }, [sort]);
 
-  const updateParams = (next: { search?: string; sort?: "latest" | "popular" }) => {
+  const updateParams = (next: { search?: string; sort?: "latest" | "popular" | "trending" }) => {
     const nextParams = new URLSearchParams(searchParams.toString());
 
     if (next.search !== undefined) {
@@ -76,7 +77,7 @@ export default function PollFilters({ search, sort, labels }: PollFiltersProps)
         <select
           value={currentSort}
           onChange={(e) => {
-            const newSort = e.target.value as "latest" | "popular";
+            const newSort = e.target.value as "latest" | "popular" | "trending";
             setCurrentSort(newSort);
             updateParams({ sort: newSort });
           }}
@@ -84,6 +85,7 @@ export default function PollFilters({ search, sort, labels }: PollFiltersProps)
         >
           <option value="latest">{labels.sortLatest}</option>
           <option value="popular">{labels.sortPopular}</option>
+          <option value="trending">{labels.sortTrending}</option>
         </select>
       </div>
     </div>
@@ -157,14 +157,25 @@ export function VoteClient({ params }: PageProps) {
 
     let ws: WebSocket | null = null;
     let reconnectTimer: NodeJS.Timeout | null = null;
+    let roomClosed = false;
 
     const connect = () => {
       ws = new WebSocket(api.getWebSocketUrl(uuid));
 
       ws.onmessage = (event: MessageEvent) => {
         try {
-          const data: VoteResults = JSON.parse(event.data);
-          setResults(data);
+          const data = JSON.parse(event.data);
+          // Server heartbeat: reply so the connection is not reaped as idle
+          if (data.type === 'ping') {
+            ws?.send('pong');
+            return;
+          }
+          // Server closes the socket right after the final results at expiry
+          if (data.type === 'room_closed') {
+            roomClosed = true;
+            setRoom(prev => (prev ? { ...prev, is_expired: true } : prev));
+          }
+          setResults(data as VoteResults);
         } catch (err) {
           console.error('WebSocket message parse error:', err);
         }
@@ -175,6 +186,7 @@ export function VoteClient({ params }: PageProps) {
       };
 
       ws.onclose = () => {
+        if (roomClosed) return;
         // Attempt reconnect after 3 seconds if still in active state
         reconnectTimer = setTimeout(() => {
           if (shouldConnectWs) {
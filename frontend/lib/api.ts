@@ -178,7 +178,7 @@ export const api = {
   listRooms: (params?: {
     search?: string;
     tags?: string[];
-    sort?: 'latest' | 'popular';
+    sort?: 'latest' | 'popular' | 'trending';
     page?: number;
     page_size?: number;
   }) => {
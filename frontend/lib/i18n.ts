@@ -164,6 +164,7 @@ export const messages = {
       sortLabel: "정렬",
       sortLatest: "최신순",
       sortPopular: "인기순",
+      sortTrending: "급상승",
       tagFilterLabel: "태그 필터",
       tagFilterPlaceholder: "태그로 필터링",
       clearFilters: "필터 초기화",
@@ -408,6 +409,7 @@ export const messages = {
       sortLabel: "Sort",
       sortLatest: "Latest",
       sortPopular: "Popular",
+      sortTrending: "Trending",
       tagFilterLabel: "Tag filter",
       tagFilterPlaceholder: "Filter by tags",
       clearFilters: "Clear filters",